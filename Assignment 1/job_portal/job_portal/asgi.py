@@ -2,6 +2,8 @@
 ASGI config for job_portal project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Set DJANGO_SETTINGS_MODULE=job_portal.settings_asgi to serve the read
+endpoints from the native async views in jobs/async_views.py.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -1,9 +1,16 @@
 # job_portal/settings.py
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# django_common (instrumentation, row serialization, replica routing) is
+# shared with the other project and lives in the repository's shared/ dir
+SHARED_DIR = str(BASE_DIR.parent.parent / 'shared')
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+
 SECRET_KEY = 'your-secret-key-here'  # Keep this secure in production
 
 DEBUG = True
@@ -22,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'django_common.sql_instrumentation.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +67,50 @@ DATABASES = {
     }
 }
 
+# Cache - local memory per process. Job listings are cached under a
+# generation counter that writes bump (see jobs/cache.py); TIMEOUT and
+# MAX_ENTRIES bound how long and how many stale pages linger. A bump only
+# reaches the process that made it: with several workers, other processes
+# serve stale listings for up to TIMEOUT unless JOBS_CACHE_ALIAS points at
+# a shared backend.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'job-portal',
+        'TIMEOUT': 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+            'CULL_FREQUENCY': 4,
+        },
+    }
+}
+
+JOBS_CACHE_ALIAS = 'default'
+JOBS_CACHE_TIMEOUT = 60  # seconds
+JOBS_CACHE_MAX_BYTES = 256 * 1024  # larger responses are not cached
+# Company dashboards count live applications, so they are only cached briefly
+JOBS_DASHBOARD_CACHE_TIMEOUT = 15  # seconds
+
+# /api/jobs/changes/: rows younger than SETTLE_SECONDS wait for the next poll,
+# tombstones (and sync tokens) are kept for RETENTION_DAYS
+JOBS_CHANGES_SETTLE_SECONDS = 2
+JOBS_TOMBSTONE_RETENTION_DAYS = 30
+
+# Keep unfiltered ?facets= counts in the FacetCount table, updated on every job
+# write; run `manage.py rebuild_job_facets` after turning this on
+JOBS_MATERIALIZED_FACETS = False
+
+# Queue applications (202 + ticket) and let `manage.py process_application_queue
+# --loop` insert them in batches, instead of one write per apply_job request
+JOBS_QUEUE_APPLICATIONS = False
+
+# Per-request query count/time headers and N+1 warnings, see django_common/sql_instrumentation.py
+SQL_INSTRUMENTATION = {
+    'QUERY_COUNT_WARNING': 50,
+    'REPEATED_QUERY_THRESHOLD': 5,
+    'RAISE': False,  # raise QueryBudgetExceeded instead of logging (useful in tests)
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
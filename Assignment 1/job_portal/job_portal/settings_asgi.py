@@ -0,0 +1,12 @@
+# job_portal/settings_asgi.py
+# ASGI deployment profile: same as settings.py, but the read endpoints are
+# routed to the native async views in jobs/async_views.py.
+#
+#   DJANGO_SETTINGS_MODULE=job_portal.settings_asgi uvicorn job_portal.asgi:application --workers 2
+from .settings import *  # noqa: F401,F403
+
+ROOT_URLCONF = 'job_portal.urls_asgi'
+
+# One ASGI worker keeps many requests in flight against the same SQLite
+# file; wait for the writer lock instead of failing with "database is locked"
+DATABASES['default'].setdefault('OPTIONS', {})['timeout'] = 20  # noqa: F405
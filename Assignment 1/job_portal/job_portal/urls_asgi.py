@@ -0,0 +1,14 @@
+# job_portal/urls_asgi.py
+from django.contrib import admin
+from django.urls import path, include
+from jobs import async_views
+
+# The async read views shadow their sync twins, everything else
+# (writes, search, stats, admin) is the regular jobs.urls
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('api/jobs/', async_views.get_jobs, name='get_jobs_async'),
+    path('api/applicants/<int:job_id>/', async_views.get_applicants, name='get_applicants_async'),
+    path('api/', include('jobs.urls')),
+    path('', async_views.api_welcome, name='api_welcome'),
+]
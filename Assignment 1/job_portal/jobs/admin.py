@@ -1,23 +1,92 @@
 # jobs/admin.py
 from django.contrib import admin
-from .models import Company, JobPost, Applicant
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from .models import Location, Company, JobPost, Applicant, ApplicationTicket
+from . import counters, search
+from .admin_tools import IdRangeFilter, ScalableAdminMixin
+from .locations import location_key
+
+
+class CompanyIdFilter(IdRangeFilter):
+    title = 'company id'
+    field_path = 'company_id'
+
+
+class ApplicantJobIdFilter(IdRangeFilter):
+    title = 'job id'
+    field_path = 'job_id'
+
+
+class ApplicantCompanyIdFilter(IdRangeFilter):
+    title = 'company id'
+    field_path = 'job__company_id'
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key']
+    search_fields = ['key', 'name']
 
 @admin.register(Company)
-class CompanyAdmin(admin.ModelAdmin):
+class CompanyAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'location', 'created_at']
     search_fields = ['name', 'location']
-    list_filter = ['created_at', 'location']
+    list_filter = ['created_at', 'location_ref']
 
 @admin.register(JobPost)
-class JobPostAdmin(admin.ModelAdmin):
-    list_display = ['title', 'company', 'salary', 'location', 'created_at']
+class JobPostAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ['title', 'company', 'salary', 'location', 'created_at', 'closes_at', 'is_active']
     search_fields = ['title', 'company__name', 'location']
-    list_filter = ['created_at', 'company', 'location']
+    # location_ref lists the small Location table, not DISTINCT over all jobs
+    list_filter = ['is_active', 'created_at', CompanyIdFilter, 'location_ref']
     raw_id_fields = ['company']
+    # str(company) is its name; skip the description columns
+    list_select_related = ['company']
+    list_only = ['title', 'salary', 'location', 'created_at', 'closes_at', 'is_active', 'company__name']
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the FTS5 index instead of LIKE '%term%' scans where available
+        if not search_term or not search.fts_enabled():
+            return super().get_search_results(request, queryset, search_term)
+        match = search.build_match_query(search_term)
+        if not match:
+            return queryset, False
+        ids = RawSQL(f'SELECT rowid FROM {search.FTS_TABLE} WHERE {search.FTS_TABLE} MATCH %s', [match])
+        return queryset.filter(Q(id__in=ids) | Q(location_ref__key=location_key(search_term))), False
 
 @admin.register(Applicant)
-class ApplicantAdmin(admin.ModelAdmin):
+class ApplicantAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'job', 'applied_at']
     search_fields = ['name', 'email', 'job__title']
-    list_filter = ['applied_at', 'job__company']
-    raw_id_fields = ['job']
\ No newline at end of file
+    list_filter = ['applied_at', ApplicantJobIdFilter, ApplicantCompanyIdFilter]
+    raw_id_fields = ['job']
+    # str(job) reads job.title and job.company.name
+    list_select_related = ['job__company']
+    list_only = ['name', 'email', 'applied_at', 'job__title', 'job__company__name']
+
+    # Applicant has no save/delete signals (they would slow every cascade
+    # and bulk path), so admin writes update JobPost.applicant_count themselves
+    def save_model(self, request, obj, form, change):
+        old_job_id = None
+        if change and 'job' in form.changed_data:
+            old_job_id = Applicant.objects.filter(pk=obj.pk).values_list('job_id', flat=True).first()
+        super().save_model(request, obj, form, change)
+        if not change:
+            counters.add_applicants(obj.job_id)
+        elif old_job_id is not None and old_job_id != obj.job_id:
+            counters.remove_applicants(old_job_id)
+            counters.add_applicants(obj.job_id)
+
+    def delete_model(self, request, obj):
+        counters.delete_applicants(Applicant.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        counters.delete_applicants(queryset)
+
+@admin.register(ApplicationTicket)
+class ApplicationTicketAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ['ticket', 'email', 'job_id', 'status', 'created_at', 'processed_at']
+    search_fields = ['ticket', 'email']
+    list_filter = ['status']
+    raw_id_fields = ['applicant']
@@ -0,0 +1,139 @@
+# jobs/archive.py
+"""
+Hot/cold split for job postings.
+
+A job is expired once closes_at has passed or it was switched off
+(is_active=False). archive_expired() copies expired jobs and their
+applicants into ArchivedJobPost / ArchivedApplicant and deletes them
+from the hot tables, so JobPost and Applicant only hold postings that can
+still be listed and applied to. Applicants move first, one chunk per
+transaction, so a busy job does not hold SQLite's write lock for all of
+its applicants at once; then each batch of jobs moves in one transaction.
+Expired jobs no longer accept applications, and a run that stops half
+way picks up the remaining applicants next time.
+
+The hot-side bookkeeping the JobPost and Applicant signals would do row
+by row is done once per batch instead: tombstones for the changes feed,
+FTS rows, materialized facet counts and the cache generation. Applicant
+counters are not touched, their jobs are leaving too.
+"""
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import cache, facets, search
+from .models import (
+    Applicant, ApplicationTicket, ArchivedApplicant, ArchivedJobPost, JobPost, JobPostTombstone,
+)
+
+DEFAULT_BATCH_SIZE = 200
+# Also the number of ids bound in one DELETE, below SQLite's 999 limit
+APPLICANT_CHUNK_SIZE = 500
+
+JOB_COLUMNS = ['id', 'company_id', 'company__name', 'title', 'description', 'salary', 'location',
+               'created_at', 'closes_at', 'applicant_count', 'location_ref_id',
+               'location_ref__name', 'is_active']
+APPLICANT_COLUMNS = ['id', 'job_id', 'name', 'email', 'resume_link', 'applied_at']
+
+
+def parse_closes_at(value):
+    """Optional closes_at from a request body, raises ValueError if malformed"""
+    if value in (None, ''):
+        return None
+    closes_at = parse_datetime(value) if isinstance(value, str) else None
+    if closes_at is None:
+        raise ValueError('closes_at must be an ISO 8601 datetime')
+    if timezone.is_naive(closes_at):
+        closes_at = timezone.make_aware(closes_at)
+    return closes_at
+
+
+def expired_jobs(now=None):
+    return JobPost.objects.filter(Q(is_active=False) | Q(closes_at__lte=now or timezone.now()))
+
+
+def _delete_rows(model, ids):
+    """
+    Plain DELETE by primary key. Model.delete() would load every row and
+    fire the per-row signals whose bookkeeping archive_batch does in bulk.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE id IN ({", ".join(["%s"] * len(ids))})', ids)
+
+
+def archive_applicant_chunk(job_ids):
+    """
+    Move up to APPLICANT_CHUNK_SIZE applicants of the given jobs to the
+    archive in one transaction. Returns how many moved, 0 once none are left.
+    """
+    with transaction.atomic():
+        chunk = list(Applicant.objects.filter(job_id__in=job_ids).order_by('id')
+                     .values_list(*APPLICANT_COLUMNS)[:APPLICANT_CHUNK_SIZE])
+        if not chunk:
+            return 0
+        ids = [row[0] for row in chunk]
+        ArchivedApplicant.objects.bulk_create([
+            ArchivedApplicant(id=pk, job_id=job_id, name=name, email=email,
+                              resume_link=resume_link, applied_at=applied_at)
+            for pk, job_id, name, email, resume_link, applied_at in chunk
+        ])
+        # Tickets keep job_id and their status; only the link to the hot row goes
+        ApplicationTicket.objects.filter(applicant_id__in=ids).update(applicant=None)
+        _delete_rows(Applicant, ids)
+    return len(ids)
+
+
+def archive_batch(job_ids):
+    """
+    Move the given jobs and their applicants to the archive tables: the
+    applicants chunk by chunk, then the jobs in one transaction. Returns
+    (jobs archived, applicants archived).
+    """
+    moved = 0
+    while count := archive_applicant_chunk(job_ids):
+        moved += count
+
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(JobPost.objects.filter(id__in=job_ids).values_list(*JOB_COLUMNS))
+        if not jobs:
+            return 0, moved
+        ids = [job[0] for job in jobs]
+        # Nothing should have applied since, but never orphan an applicant
+        while count := archive_applicant_chunk(ids):
+            moved += count
+        ArchivedJobPost.objects.bulk_create([
+            ArchivedJobPost(id=pk, company_id=company_id, company_name=company_name, title=title,
+                            description=description, salary=salary, location=location,
+                            created_at=created_at, closes_at=closes_at,
+                            applicant_count=applicant_count, archived_at=now)
+            for (pk, company_id, company_name, title, description, salary, location,
+                 created_at, closes_at, applicant_count, *_) in jobs
+        ])
+        _delete_rows(JobPost, ids)
+
+        JobPostTombstone.objects.bulk_create([JobPostTombstone(job_id=pk, deleted_at=now) for pk in ids])
+        search.unindex_jobs(ids)
+        if facets.materialized_enabled():
+            facets.record_jobs(
+                (facets.job_buckets(location_id, location_name, company_id, company_name, salary, is_active)
+                 for (_, company_id, company_name, _, _, salary, _, _, _, _,
+                      location_id, location_name, is_active) in jobs),
+                delta=-1,
+            )
+    return len(ids), moved
+
+
+def archive_expired(batch_size=DEFAULT_BATCH_SIZE, now=None):
+    """Archive every expired job, batch by batch. Yields (jobs, applicants) per batch."""
+    now = now or timezone.now()
+    try:
+        while True:
+            job_ids = list(expired_jobs(now).order_by('id').values_list('id', flat=True)[:batch_size])
+            if not job_ids:
+                return
+            yield archive_batch(job_ids)
+    finally:
+        cache.bump_generation()
@@ -0,0 +1,111 @@
+# jobs/async_views.py
+"""
+Native async versions of the read endpoints, served by the ASGI profile
+(job_portal.settings_asgi -> job_portal.urls_asgi). They share filters,
+pagination and row serializers with jobs/views.py and only differ in using
+the async ORM (aget, async for, chunked iteration through streaming.aiterate), so an ASGI worker can keep
+many slow clients in flight without a thread per request.
+
+The per-process response cache and ETag validators stay on the WSGI
+views: Django calls condition()'s validator functions synchronously,
+which is not allowed to touch the database from an event loop.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from django_common.pagination import InvalidCursor, finish_page, keyset_queryset, parse_limit
+from django_common.rows import RowJsonResponse
+
+from . import facets
+from .filters import filter_jobs, include_fields, is_filtered
+from .models import Applicant, JobPost
+from .streaming import aiterate, async_streaming_response, stream_format
+from .views import APPLICANT_ROWS, job_rows, row_cursor_key, welcome_data
+
+
+@require_http_methods(["GET"])
+async def get_jobs(request):
+    """Async get_jobs, same parameters and response"""
+    try:
+        facet_names = facets.parse_facets(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    try:
+        rows = job_rows(include_fields(request.GET))
+        build = rows.builder(JobPost)
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+            filtered = filter_jobs(JobPost.objects.all(), request.GET)
+            fmt = stream_format(request)
+            if fmt:
+                return async_streaming_response(fmt, rows.values(filtered.order_by('-created_at', 'id')),
+                                                build, 'jobs')
+            jobs = keyset_queryset(rows.values(filtered), request.GET.get('cursor'))
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except ValueError:
+            return JsonResponse({
+                'error': 'company_id, salary_min and salary_max must be integers'
+            }, status=400)
+
+        page = [row async for row in jobs[:limit + 1]]
+        page, next_cursor = finish_page(page, limit, key=row_cursor_key(rows))
+        jobs_data = [build(row) for row in page]
+
+        data = {
+            'jobs': jobs_data,
+            'total': len(jobs_data),
+            'next_cursor': next_cursor
+        }
+        if facet_names:
+            if (facets.materialized_enabled() and not is_filtered(request.GET)
+                    and await sync_to_async(facets.materialized_current)()):
+                data['facets'] = await sync_to_async(facets.materialized_facets)(facet_names)
+            else:
+                data['facets'] = await facets.acompute_facets(filtered, facet_names)
+
+        return RowJsonResponse(data, status=200)
+
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
+
+@require_http_methods(["GET"])
+async def get_applicants(request, job_id):
+    """Async get_applicants, same parameters and response"""
+    try:
+        try:
+            job = await JobPost.objects.select_related('company').aget(id=job_id)
+        except JobPost.DoesNotExist:
+            return JsonResponse({'error': 'Job not found'}, status=404)
+
+        applicants = APPLICANT_ROWS.values(Applicant.objects.filter(job_id=job.id))
+        build = APPLICANT_ROWS.builder(Applicant)
+        job_data = {'id': job.id, 'title': job.title, 'company': job.company.name}
+
+        fmt = stream_format(request)
+        if fmt:
+            return async_streaming_response(fmt, applicants, build, 'applicants',
+                                            total_key='total_applicants', header={'job': job_data})
+
+        applicants_data = [build(row) async for row in aiterate(applicants)]
+
+        return RowJsonResponse({
+            'job': job_data,
+            'applicants': applicants_data,
+            'total_applicants': len(applicants_data)
+        }, status=200)
+
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
+
+async def api_welcome(request):
+    """Welcome page for the API"""
+    return JsonResponse(welcome_data())
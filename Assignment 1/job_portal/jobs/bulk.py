@@ -0,0 +1,156 @@
+# jobs/bulk.py
+import json
+
+from django.db import transaction
+
+from . import cache, facets, search
+from .archive import parse_closes_at
+from .locations import resolve_locations
+from .models import Company, JobPost
+
+MAX_BULK_ITEMS = 5000
+
+# SQLite builds before 3.32 cap bound parameters at 999; stay well below
+# it for IN (...) lookups. bulk_create() sizes its INSERTs itself from the
+# backend's limit (999 // 11 JobPost columns = 90 rows per statement)
+LOOKUP_CHUNK_SIZE = 500
+
+# Rows committed per transaction, so the write lock is released between
+# batches and readers/other writers can get in
+ROWS_PER_TRANSACTION = 500
+
+REQUIRED_JOB_FIELDS = ['company_id', 'title', 'description', 'salary', 'location']
+
+
+class BulkPayloadError(ValueError):
+    """The request body as a whole could not be read"""
+
+
+def parse_bulk_body(request):
+    """
+    Accept a JSON array, {"jobs": [...]}, or NDJSON (one job per line).
+    Returns a list of raw items.
+    """
+    content_type = request.content_type or ''
+    body = request.body.decode('utf-8')
+
+    if 'ndjson' in content_type:
+        try:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        except json.JSONDecodeError as e:
+            raise BulkPayloadError(f'Invalid NDJSON on line {e.lineno}')
+    else:
+        try:
+            items = json.loads(body)
+        except json.JSONDecodeError:
+            raise BulkPayloadError('Invalid JSON data')
+        if isinstance(items, dict):
+            items = items.get('jobs')
+
+    if not isinstance(items, list):
+        raise BulkPayloadError('Expected a JSON array of jobs')
+    if not items:
+        raise BulkPayloadError('No jobs given')
+    if len(items) > MAX_BULK_ITEMS:
+        raise BulkPayloadError(f'At most {MAX_BULK_ITEMS} jobs per request')
+    return items
+
+
+def clean_job_item(item):
+    """Validate one item, returns (cleaned_fields, error_message)"""
+    if not isinstance(item, dict):
+        return None, 'Each job must be an object'
+
+    for field in REQUIRED_JOB_FIELDS:
+        if field not in item:
+            return None, f'{field} is required'
+    for field in ['title', 'description', 'location']:
+        if not isinstance(item[field], str) or not item[field].strip():
+            return None, f'{field} is required'
+
+    try:
+        company_id = int(item['company_id'])
+    except (TypeError, ValueError):
+        return None, 'company_id must be an integer'
+
+    salary = item['salary']
+    if isinstance(salary, bool) or not isinstance(salary, int):
+        return None, 'Salary must be an integer'
+    if salary <= 0:
+        return None, 'Salary must be positive'
+
+    try:
+        closes_at = parse_closes_at(item.get('closes_at'))
+    except ValueError as e:
+        return None, str(e)
+
+    return {
+        'company_id': company_id,
+        'title': item['title'].strip(),
+        'description': item['description'].strip(),
+        'salary': salary,
+        'location': item['location'].strip(),
+        'closes_at': closes_at,
+    }, None
+
+
+def existing_companies(company_ids):
+    """{id: name} for the ids that exist, looked up in bounded IN (...) chunks"""
+    company_ids = sorted(set(company_ids))
+    found = {}
+    for start in range(0, len(company_ids), LOOKUP_CHUNK_SIZE):
+        chunk = company_ids[start:start + LOOKUP_CHUNK_SIZE]
+        found.update(Company.objects.filter(id__in=chunk).values_list('id', 'name'))
+    return found
+
+
+def bulk_create_jobs(items):
+    """
+    Validate every item, then insert the valid ones with bulk_create in
+    short transactions. Returns (created, errors) where created is a list
+    of (index, JobPost) and errors a list of {'index', 'error'}.
+    """
+    errors = []
+    valid = []
+    for index, item in enumerate(items):
+        cleaned, error = clean_job_item(item)
+        if error:
+            errors.append({'index': index, 'error': error})
+        else:
+            valid.append((index, cleaned))
+
+    companies = existing_companies(cleaned['company_id'] for _, cleaned in valid)
+
+    # bulk_create skips pre_save, so resolve locations for the whole payload here
+    locations = resolve_locations(cleaned['location'] for _, cleaned in valid)
+
+    pending = []
+    for index, cleaned in valid:
+        if cleaned['company_id'] not in companies:
+            errors.append({'index': index, 'error': 'Company not found'})
+        else:
+            pending.append((index, JobPost(location_ref=locations.get(cleaned['location']), **cleaned)))
+
+    created = []
+    for start in range(0, len(pending), ROWS_PER_TRANSACTION):
+        batch = pending[start:start + ROWS_PER_TRANSACTION]
+        with transaction.atomic():
+            JobPost.objects.bulk_create([job for _, job in batch])
+            # bulk_create skips post_save, so index the batch here
+            search.index_jobs(
+                (job.id, job.title, job.description, companies[job.company_id])
+                for _, job in batch
+            )
+            if facets.materialized_enabled():
+                facets.record_jobs(
+                    facets.job_buckets(job.location_ref_id, job.location_ref and job.location_ref.name,
+                                       job.company_id, companies[job.company_id], job.salary)
+                    for _, job in batch
+                )
+        created.extend(batch)
+
+    if created:
+        cache.bump_generation()
+
+    errors.sort(key=lambda error: error['index'])
+    return created, errors
@@ -0,0 +1,100 @@
+# jobs/cache.py
+"""
+Response cache for the job read endpoints.
+
+Every key embeds a generation number. Writes that change what the
+listings return (new company, new/edited/deleted job, admin saves) bump
+the generation through the signals in jobs/signals.py, so all cached
+pages go stale at once without having to find and delete them. Old
+entries simply stop being read and age out through the cache TIMEOUT and
+MAX_ENTRIES culling configured in settings.CACHES.
+
+A bump inside a transaction is repeated once it commits: until then
+other requests still read the old rows and may cache them under the new
+generation.
+
+The generation lives in the cache backend itself. With the default
+per-process LocMemCache each process only sees its own bumps, and other
+workers keep serving their cached pages for up to TIMEOUT. Point
+JOBS_CACHE_ALIAS at a shared backend (Redis, Memcached, DatabaseCache)
+when running several processes and staleness across them matters.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+from .streaming import stream_format
+
+GENERATION_KEY = 'jobs:generation'
+
+
+def get_cache():
+    return caches[getattr(settings, 'JOBS_CACHE_ALIAS', 'default')]
+
+
+def current_generation():
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_generation():
+    _bump()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(_bump)
+
+
+def _bump():
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # Key missing (first write, or evicted): start a generation that
+        # cannot collide with whatever readers used before
+        cache.set(GENERATION_KEY, current_generation() + 1, timeout=None)
+
+
+def response_cache_key(request, prefix):
+    query = '&'.join(f'{k}={v}' for k, v in sorted(request.GET.lists()))
+    digest = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'jobs:{prefix}:v{current_generation()}:{digest}'
+
+
+def cache_response(prefix, timeout=None, skip=None):
+    """
+    Cache successful GET responses of a view under a generation-versioned
+    key. Streaming responses, bodies above JOBS_CACHE_MAX_BYTES and
+    requests for which skip(request) is true are never stored.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or stream_format(request) or (skip and skip(request)):
+                return view_func(request, *args, **kwargs)
+
+            cache = get_cache()
+            key = response_cache_key(request, prefix)
+            hit = cache.get(key)
+            if hit is not None:
+                content, content_type = hit
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            max_bytes = getattr(settings, 'JOBS_CACHE_MAX_BYTES', 256 * 1024)
+            if (response.status_code == 200 and not response.streaming
+                    and len(response.content) <= max_bytes):
+                ttl = timeout if timeout is not None else getattr(settings, 'JOBS_CACHE_TIMEOUT', 60)
+                cache.set(key, (response.content, response['Content-Type']), ttl)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
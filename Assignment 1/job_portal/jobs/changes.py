@@ -0,0 +1,84 @@
+# jobs/changes.py
+"""
+Sync tokens for the /api/jobs/changes/ delta feed.
+
+A token records how far a client has read two ordered streams: jobs by
+(updated_at, id) and JobPostTombstone rows by (deleted_at, id). Each
+poll returns what comes after both positions and a new token, so its
+cost depends on how much changed rather than on the size of the catalog.
+
+Rows are only handed out once they are JOBS_CHANGES_SETTLE_SECONDS old.
+A transaction that stamped updated_at just before another one but
+commits just after it would otherwise land behind a position a client
+has already moved past.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from django_common.pagination import InvalidCursor, decode_token, encode_token
+
+SyncToken = namedtuple('SyncToken', 'jobs tombstones issued_at')
+
+
+def _timestamp(value):
+    """Tokens carry aware datetimes, anything else was not made by us"""
+    timestamp = datetime.fromisoformat(value)
+    if timezone.is_naive(timestamp):
+        raise ValueError('naive timestamp')
+    return timestamp
+
+
+def _position(value):
+    if value is None:
+        return None
+    timestamp, pk = value
+    return _timestamp(timestamp), int(pk)
+
+
+def parse_sync_token(token):
+    """
+    ?since= value -> SyncToken. Positions are (timestamp, id) or None for
+    "from the beginning"; no token at all means a full sync.
+    """
+    if not token:
+        return SyncToken(None, None, None)
+    data = decode_token(token)
+    try:
+        return SyncToken(_position(data['j']), _position(data['t']),
+                         _timestamp(data['at']))
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('Invalid sync token')
+
+
+def make_sync_token(jobs, tombstones):
+    def dump(position):
+        return None if position is None else [position[0].isoformat(), position[1]]
+    return encode_token({'j': dump(jobs), 't': dump(tombstones),
+                         'at': timezone.now().isoformat()})
+
+
+def token_expired(sync):
+    """Tombstones older than the retention window may already be pruned"""
+    if sync.issued_at is None:
+        return False
+    retention = timedelta(days=getattr(settings, 'JOBS_TOMBSTONE_RETENTION_DAYS', 30))
+    return sync.issued_at < timezone.now() - retention
+
+
+def settled_before():
+    return timezone.now() - timedelta(seconds=getattr(settings, 'JOBS_CHANGES_SETTLE_SECONDS', 2))
+
+
+def rows_after(queryset, field, position, until):
+    """queryset ordered by (field, id), past position and before until"""
+    queryset = queryset.filter(**{f'{field}__lt': until}).order_by(field, 'id')
+    if position is not None:
+        timestamp, pk = position
+        queryset = queryset.filter(
+            Q(**{f'{field}__gt': timestamp}) | Q(**{field: timestamp, 'id__gt': pk})
+        )
+    return queryset
@@ -0,0 +1,97 @@
+# jobs/conditional.py
+"""
+Cheap validators for conditional GETs on the job read endpoints.
+
+Each one is a few aggregate queries (MAX timestamp + row count) so a
+client revalidating with If-None-Match / If-Modified-Since gets its 304
+without the body ever being built. Both ETags also fold in the cache
+generation from jobs/cache.py, which changes on job/company edits that
+leave the newest timestamp and the row count untouched, so the ETag is
+the precise validator.
+
+Last-Modified for the job listing is the latest JobPost.updated_at,
+tombstone or passed closes_at, over all jobs: edits, deletes, expiries
+and jobs leaving the filtered set all move it. Expiry bumps no cache
+generation, so cached validators and pages notice it within the cache
+TIMEOUT. Applicants have neither an updated_at nor tombstones,
+so their listing only gets an ETag.
+"""
+import hashlib
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from . import cache
+from .filters import filter_jobs, wants_live_counts
+from .models import Applicant, JobPost, JobPostTombstone
+from .streaming import stream_format
+
+
+def _memoize_on_request(attr):
+    """condition() asks for the ETag and Last-Modified separately, run the query once"""
+    def decorator(func):
+        def wrapper(request, *args, **kwargs):
+            if not hasattr(request, attr):
+                setattr(request, attr, func(request, *args, **kwargs))
+            return getattr(request, attr)
+        return wrapper
+    return decorator
+
+
+def _etag(request, *parts):
+    # The same URL can be negotiated to NDJSON through Accept, keep those apart
+    parts += (request.GET.urlencode(), stream_format(request))
+    return hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+@_memoize_on_request('_jobs_validators')
+def jobs_validators(request):
+    if wants_live_counts(request):
+        return None, None
+    # The aggregate itself only changes with the generation, so it is
+    # cached alongside the responses and a warm revalidation is query-free
+    key = cache.response_cache_key(request, 'jobs-validators')
+    stats = cache.get_cache().get(key)
+    if stats is None:
+        try:
+            jobs = filter_jobs(JobPost.objects.all(), request.GET)
+        except ValueError:
+            return None, None  # the view will answer 400
+        stats = jobs.order_by().aggregate(count=Count('id'))
+        stats['latest'] = _jobs_last_change()
+        cache.get_cache().set(key, stats)
+    etag = _etag(request, stats['count'], stats['latest'], cache.current_generation())
+    return etag, stats['latest']
+
+
+def _jobs_last_change():
+    """
+    Newest JobPost.updated_at, expiry or deletion. The same for every listing URL,
+    so it is cached once per generation rather than per URL.
+    """
+    key = f'jobs:last-change:v{cache.current_generation()}'
+    latest = cache.get_cache().get(key)
+    if latest is None:
+        jobs = JobPost.objects.order_by().aggregate(
+            changed=Max('updated_at'), expired=Max('closes_at', filter=Q(closes_at__lte=timezone.now())))
+        deleted = JobPostTombstone.objects.order_by().aggregate(latest=Max('deleted_at'))['latest']
+        latest = max(filter(None, (jobs['changed'], jobs['expired'], deleted)), default=None)
+        cache.get_cache().set(key, latest)
+    return latest
+
+
+def jobs_etag(request):
+    return jobs_validators(request)[0]
+
+
+def jobs_last_modified(request):
+    return jobs_validators(request)[1]
+
+
+def applicants_etag(request, job_id):
+    # No ETag for a missing job, so If-None-Match: * falls through to the 404
+    if not JobPost.objects.filter(id=job_id).exists():
+        return None
+    stats = Applicant.objects.filter(job_id=job_id).order_by().aggregate(
+        latest=Max('applied_at'), count=Count('id'))
+    return _etag(request, job_id, stats['count'], stats['latest'], cache.current_generation())
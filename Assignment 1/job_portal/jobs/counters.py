@@ -0,0 +1,46 @@
+# jobs/counters.py
+from django.db.models import Count, F
+
+from .models import JobPost
+
+
+def add_applicants(job_id, count=1):
+    """Atomic UPDATE ... SET applicant_count = applicant_count + n, no read"""
+    JobPost.objects.filter(id=job_id).update(applicant_count=F('applicant_count') + count)
+
+
+def remove_applicants(job_id, count=1):
+    JobPost.objects.filter(id=job_id, applicant_count__gte=count).update(
+        applicant_count=F('applicant_count') - count
+    )
+
+
+def delete_applicants(queryset):
+    """
+    Delete applicants and take them off their jobs' counters, one UPDATE
+    per job. There is deliberately no post_delete receiver doing this per
+    row: it would turn every cascade (job, company, admin bulk delete)
+    into a SELECT plus one UPDATE per applicant.
+    """
+    per_job = dict(queryset.order_by().values_list('job_id').annotate(n=Count('id')))
+    deleted, _ = queryset.delete()
+    for job_id, count in per_job.items():
+        remove_applicants(job_id, count)
+    return deleted
+
+
+def reconcile_applicant_counts():
+    """
+    Recount applicants for every job and fix the ones that drifted
+    (raw SQL, admin bulk deletes, crashes between statements).
+    Returns [(job_id, stored, actual)] for the rows that were corrected.
+    """
+    drifted = list(
+        JobPost.objects.order_by()
+        .annotate(actual=Count('applicants'))
+        .exclude(applicant_count=F('actual'))
+        .values_list('id', 'applicant_count', 'actual')
+    )
+    for job_id, _, actual in drifted:
+        JobPost.objects.filter(id=job_id).update(applicant_count=actual)
+    return drifted
@@ -0,0 +1,188 @@
+# jobs/facets.py
+"""
+Facet counts for the job listing (?facets=location,company,salary_band).
+
+For a filtered listing each requested facet is one GROUP BY over the
+same filtered queryset: location and company group on their foreign
+keys, salary_band on a CASE expression over SALARY_BANDS.
+
+Only open jobs are counted (filters.open_jobs). The unfiltered listing asks the same
+question on every visit. With JOBS_MATERIALIZED_FACETS on, its answer
+is kept in the FacetCount table. post_job, the bulk endpoint and admin edits adjust it through
+the JobPost signals, and one indexed read returns all facets.
+`manage.py rebuild_job_facets` recomputes the table from scratch. Run it
+after turning the setting on or after bulk loads that skip signals.
+
+The table counts every is_active job. A job that passes its closes_at
+stays counted until archive_expired_jobs moves it away, so while any
+such job exists materialized_current() is False and the listing falls
+back to the GROUP BY queries.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, Count, F, Value, When
+from django.utils import timezone
+
+from .models import FacetCount, JobPost
+
+FACETS = ('location', 'company', 'salary_band')
+FACET_LIMIT = 20  # largest location/company buckets returned
+
+# (label, lower bound inclusive, upper bound exclusive or None)
+SALARY_BANDS = [
+    ('0-25k', 0, 25000),
+    ('25k-50k', 25000, 50000),
+    ('50k-100k', 50000, 100000),
+    ('100k-200k', 100000, 200000),
+    ('200k+', 200000, None),
+]
+
+
+def materialized_enabled():
+    return getattr(settings, 'JOBS_MATERIALIZED_FACETS', False)
+
+
+def parse_facets(params):
+    """Facet names from ?facets=a,b; raises ValueError on an unknown one"""
+    names = [name.strip() for name in params.get('facets', '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in FACETS]
+    if unknown:
+        raise ValueError(f'Unknown facet: {unknown[0]}')
+    return list(dict.fromkeys(names))
+
+
+def salary_band(salary):
+    for label, low, high in SALARY_BANDS:
+        if salary >= low and (high is None or salary < high):
+            return label
+    return SALARY_BANDS[0][0]  # negative salaries are rejected on input
+
+
+def _band_expression():
+    whens = [When(salary__lt=high, then=Value(label)) for label, _, high in SALARY_BANDS if high]
+    return Case(*whens, default=Value(SALARY_BANDS[-1][0]), output_field=CharField())
+
+
+def facet_queries(queryset, names, limit=FACET_LIMIT):
+    """{facet: grouped values() queryset} over an already filtered queryset"""
+    queryset = queryset.order_by()
+    queries = {}
+    if 'location' in names:
+        queries['location'] = (
+            queryset.filter(location_ref__isnull=False)
+            .values_list('location_ref_id', 'location_ref__name')
+            .annotate(count=Count('id')).order_by('-count', 'location_ref__name')[:limit]
+        )
+    if 'company' in names:
+        queries['company'] = (
+            queryset.values_list('company_id', 'company__name')
+            .annotate(count=Count('id')).order_by('-count', 'company__name')[:limit]
+        )
+    if 'salary_band' in names:
+        queries['salary_band'] = (
+            queryset.annotate(band=_band_expression())
+            .values_list('band').annotate(count=Count('id')).order_by()
+        )
+    return queries
+
+
+def _shape(name, rows):
+    """Grouped rows -> response buckets"""
+    if name == 'salary_band':
+        counts = dict(rows)
+        return [{'band': label, 'count': counts.get(label, 0)} for label, _, _ in SALARY_BANDS]
+    return [{'id': pk, 'name': label, 'count': count} for pk, label, count in rows]
+
+
+def compute_facets(queryset, names):
+    return {name: _shape(name, list(query)) for name, query in facet_queries(queryset, names).items()}
+
+
+async def acompute_facets(queryset, names):
+    return {name: _shape(name, [row async for row in query])
+            for name, query in facet_queries(queryset, names).items()}
+
+
+def materialized_current(now=None):
+    """False while an active job is past closes_at but not archived yet (indexed EXISTS)"""
+    return not JobPost.objects.filter(is_active=True, closes_at__lte=now or timezone.now()).exists()
+
+
+def materialized_facets(names):
+    """Same result as compute_facets over all active jobs, read from FacetCount"""
+    grouped = {name: [] for name in names}
+    for facet, bucket, label, count in (
+        FacetCount.objects.filter(facet__in=names, count__gt=0)
+        .order_by('facet', '-count', 'label')
+        .values_list('facet', 'bucket', 'label', 'count')
+    ):
+        grouped[facet].append((bucket, label, count))
+
+    result = {}
+    for name in names:
+        rows = grouped[name]
+        if name == 'salary_band':
+            result[name] = _shape(name, [(bucket, count) for bucket, _, count in rows])
+        else:
+            result[name] = _shape(name, [(int(bucket), label, count)
+                                         for bucket, label, count in rows[:FACET_LIMIT]])
+    return result
+
+
+def job_buckets(location_id, location_name, company_id, company_name, salary, is_active=True):
+    """FacetCount (facet, bucket, label) keys one job falls into, none if inactive"""
+    if not is_active:
+        return []
+    buckets = [('company', str(company_id), company_name),
+               ('salary_band', salary_band(salary), salary_band(salary))]
+    if location_id is not None:
+        buckets.append(('location', str(location_id), location_name))
+    return buckets
+
+
+def apply_deltas(deltas):
+    """Add {(facet, bucket, label): delta} to the materialized counts"""
+    for (facet, bucket, label), delta in deltas.items():
+        if not delta:
+            continue
+        rows = FacetCount.objects.filter(facet=facet, bucket=bucket)
+        if rows.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                FacetCount.objects.create(facet=facet, bucket=bucket, label=label, count=delta)
+        except IntegrityError:
+            # Created by a concurrent writer in the meantime
+            rows.update(count=F('count') + delta)
+
+
+def record_jobs(jobs, delta=1):
+    """Count job_buckets() tuples in (+1) or out (-1) of the materialized facets"""
+    deltas = Counter()
+    for buckets in jobs:
+        for key in buckets:
+            deltas[key] += delta
+    apply_deltas(deltas)
+
+
+def rename_bucket(facet, pk, label):
+    FacetCount.objects.filter(facet=facet, bucket=str(pk)).update(label=label)
+
+
+def rebuild_facets():
+    """Recompute FacetCount from JobPost, returns the number of buckets"""
+    buckets = []
+    for name, query in facet_queries(JobPost.objects.filter(is_active=True), FACETS, limit=None).items():
+        for row in query:
+            if name == 'salary_band':
+                band, count = row
+                buckets.append(FacetCount(facet=name, bucket=band, label=band, count=count))
+            else:
+                pk, label, count = row
+                buckets.append(FacetCount(facet=name, bucket=str(pk), label=label, count=count))
+    with transaction.atomic():
+        FacetCount.objects.all().delete()
+        FacetCount.objects.bulk_create(buckets, batch_size=500)
+    return len(buckets)
@@ -0,0 +1,59 @@
+# jobs/filters.py
+from django.db.models import Q
+from django.utils import timezone
+
+from .locations import location_key
+
+
+def open_jobs(queryset, now=None):
+    """
+    Jobs that can still be listed and applied to: active and not past
+    closes_at (JobPost.accepts_applications). Expired jobs drop out here
+    at once, before archive_expired_jobs moves them away.
+    """
+    return queryset.filter(Q(closes_at__isnull=True) | Q(closes_at__gt=now or timezone.now()),
+                           is_active=True)
+
+
+def filter_jobs(queryset, params):
+    """
+    Apply the optional ?location=, ?company_id=, ?salary_min= and
+    ?salary_max= filters. Raises ValueError on a malformed number.
+    Closed or expired (not yet archived) jobs are never listed.
+    """
+    queryset = open_jobs(queryset)
+    location = params.get('location', '').strip()
+    if location:
+        # Indexed equality on the canonical key (see jobs/locations.py)
+        queryset = queryset.filter(location_ref__key=location_key(location))
+
+    if params.get('company_id'):
+        queryset = queryset.filter(company_id=int(params['company_id']))
+    if params.get('salary_min'):
+        queryset = queryset.filter(salary__gte=int(params['salary_min']))
+    if params.get('salary_max'):
+        queryset = queryset.filter(salary__lte=int(params['salary_max']))
+
+    return queryset
+
+
+FILTER_PARAMS = ('location', 'company_id', 'salary_min', 'salary_max')
+
+
+def is_filtered(params):
+    """True when any filter_jobs() parameter is set"""
+    return any(params.get(name, '').strip() for name in FILTER_PARAMS)
+
+
+def include_fields(params):
+    """Optional extra fields requested with ?include=a,b"""
+    return {field.strip() for field in params.get('include', '').split(',') if field.strip()}
+
+
+def wants_live_counts(request):
+    """
+    applicant_count changes on every application without bumping the cache
+    generation, so listings that include it skip the response cache and
+    conditional GET validators
+    """
+    return 'applicant_count' in include_fields(request.GET)
@@ -0,0 +1,125 @@
+# jobs/ingest.py
+"""
+Write-behind ingestion for job applications.
+
+With settings.JOBS_QUEUE_APPLICATIONS = True, apply_job only appends an
+ApplicationTicket (a single small INSERT, no JobPost lookup) and answers
+202. `python manage.py process_application_queue` then drains pending
+tickets in batches: one query for the jobs, one for already existing
+(email, job) pairs, one bulk INSERT of applicants and one bulk UPDATE of
+tickets per transaction, so a burst of N applications costs N / batch
+write-lock acquisitions instead of N.
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import counters
+from .models import Applicant, ApplicationTicket, JobPost
+
+DEFAULT_BATCH_SIZE = 200
+
+DUPLICATE_ERROR = 'You have already applied for this job'
+
+
+def queue_enabled():
+    return getattr(settings, 'JOBS_QUEUE_APPLICATIONS', False)
+
+
+def enqueue_application(name, email, resume_link, job_id):
+    return ApplicationTicket.objects.create(
+        name=name, email=email, resume_link=resume_link, job_id=job_id
+    )
+
+
+def _reject(ticket, error):
+    ticket.status = ApplicationTicket.STATUS_REJECTED
+    ticket.error = error
+
+
+def process_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Turn up to batch_size pending tickets into applicants in one
+    transaction. Returns the number of tickets processed.
+    """
+    with transaction.atomic():
+        tickets = list(
+            ApplicationTicket.objects
+            .filter(status=ApplicationTicket.STATUS_PENDING)
+            .order_by('id')[:batch_size]
+        )
+        if not tickets:
+            return 0
+
+        job_ids = {ticket.job_id for ticket in tickets}
+        emails = {ticket.email for ticket in tickets}
+        now = timezone.now()
+        jobs = {job.id: job for job in JobPost.objects.filter(id__in=job_ids).only('is_active', 'closes_at')}
+        # unique_together = ['email', 'job']: load the pairs already taken
+        taken = set(
+            Applicant.objects.filter(job_id__in=job_ids, email__in=emails)
+            .values_list('email', 'job_id')
+        )
+
+        accepted = []
+        for ticket in tickets:
+            key = (ticket.email, ticket.job_id)
+            if ticket.job_id not in jobs:
+                _reject(ticket, 'Job not found')
+            elif not jobs[ticket.job_id].accepts_applications(now):
+                _reject(ticket, 'This job is no longer accepting applications')
+            elif key in taken:
+                _reject(ticket, DUPLICATE_ERROR)
+            else:
+                taken.add(key)  # also catches duplicates inside this batch
+                accepted.append((ticket, Applicant(
+                    name=ticket.name, email=ticket.email,
+                    resume_link=ticket.resume_link, job_id=ticket.job_id,
+                )))
+
+        _insert_applicants(accepted)
+
+        for ticket in tickets:
+            ticket.processed_at = now
+        ApplicationTicket.objects.bulk_update(
+            tickets, ['status', 'applicant', 'error', 'processed_at']
+        )
+    return len(tickets)
+
+
+def _insert_applicants(accepted):
+    if not accepted:
+        return
+    try:
+        with transaction.atomic():
+            Applicant.objects.bulk_create([applicant for _, applicant in accepted])
+        inserted = accepted
+    except IntegrityError:
+        # A direct apply_job raced us for one of the pairs, fall back to
+        # row by row so only the clashing ticket is rejected
+        inserted = []
+        for ticket, applicant in accepted:
+            try:
+                with transaction.atomic():
+                    applicant.save()
+                inserted.append((ticket, applicant))
+            except IntegrityError:
+                _reject(ticket, DUPLICATE_ERROR)
+
+    per_job = {}
+    for ticket, applicant in inserted:
+        ticket.status = ApplicationTicket.STATUS_ACCEPTED
+        ticket.applicant = applicant
+        per_job[applicant.job_id] = per_job.get(applicant.job_id, 0) + 1
+    for job_id, count in per_job.items():
+        counters.add_applicants(job_id, count)
+
+
+def drain_queue(batch_size=DEFAULT_BATCH_SIZE):
+    """Process batches until nothing is pending, returns the total processed"""
+    total = 0
+    while True:
+        processed = process_batch(batch_size)
+        if not processed:
+            return total
+        total += processed
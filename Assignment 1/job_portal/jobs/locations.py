@@ -0,0 +1,102 @@
+# jobs/locations.py
+"""
+Normalized location dimension.
+
+Company.location and JobPost.location keep the text the client sent.
+Each row also points at a Location whose unique `key` is the canonical
+form of that text (accents and punctuation dropped, case folded,
+whitespace collapsed), so " New-Delhi", "new delhi" and "NEW DELHI."
+share one row. Filters compare keys with an indexed equality lookup
+instead of location__iexact scans.
+
+New rows get their Location in a pre_save signal (jobs/signals.py) or,
+for bulk_create paths, from resolve_locations(). Rows written before
+the table existed are linked by migration 0007; `manage.py
+backfill_locations` repeats that for rows written around the signals
+(raw SQL, QuerySet.update) or, with --all, after location_key changes.
+"""
+import re
+import unicodedata
+
+from django.db import transaction
+
+from .models import Location
+
+LOOKUP_CHUNK_SIZE = 500
+BACKFILL_CHUNK_SIZE = 2000
+
+_NON_WORD_RE = re.compile(r'[\W_]+')
+
+
+def location_key(text):
+    """Canonical key for a free-text location, '' if nothing is left"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD_RE.sub(' ', text.casefold()).strip()
+
+
+def resolve_locations(names):
+    """
+    {name: Location} for the given strings, creating missing Location
+    rows. Names without a usable key are left out.
+    """
+    by_key = {}
+    for name in set(names):
+        key = location_key(name)
+        if key:
+            by_key.setdefault(key, []).append(name)
+
+    keys = sorted(by_key)
+    found = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+        found.update((loc.key, loc) for loc in Location.objects.filter(key__in=chunk))
+
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # ignore_conflicts: a concurrent writer may create the same keys
+        Location.objects.bulk_create(
+            [Location(key=key, name=by_key[key][0].strip()) for key in missing],
+            batch_size=LOOKUP_CHUNK_SIZE, ignore_conflicts=True,
+        )
+        for start in range(0, len(missing), LOOKUP_CHUNK_SIZE):
+            chunk = missing[start:start + LOOKUP_CHUNK_SIZE]
+            found.update((loc.key, loc) for loc in Location.objects.filter(key__in=chunk))
+
+    return {name: found[key] for key, group in by_key.items() for name in group}
+
+
+def resolve_location(name):
+    """Location for one string (created if needed), None if it has no key"""
+    key = location_key(name)
+    if not key:
+        return None
+    location, _ = Location.objects.get_or_create(key=key, defaults={'name': name.strip()})
+    return location
+
+
+def backfill_locations(model, only_missing=True, chunk_size=BACKFILL_CHUNK_SIZE):
+    """
+    Point model's rows (Company or JobPost) at their Location, walking the
+    table in id order one chunk at a time. Returns the number of rows set.
+    """
+    rows = model.objects.order_by('id')
+    if only_missing:
+        rows = rows.filter(location_ref__isnull=True)
+
+    updated = 0
+    last_id = 0
+    while True:
+        chunk = list(rows.filter(id__gt=last_id).values_list('id', 'location')[:chunk_size])
+        if not chunk:
+            return updated
+        last_id = chunk[-1][0]
+        refs = resolve_locations(location for _, location in chunk)
+
+        ids_by_ref = {}
+        for pk, location in chunk:
+            if location in refs:
+                ids_by_ref.setdefault(refs[location].id, []).append(pk)
+        with transaction.atomic():
+            for ref_id, ids in ids_by_ref.items():
+                updated += model.objects.filter(id__in=ids).update(location_ref_id=ref_id)
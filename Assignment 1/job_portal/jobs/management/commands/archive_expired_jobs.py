@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from jobs.archive import DEFAULT_BATCH_SIZE, archive_expired, expired_jobs
+
+
+class Command(BaseCommand):
+    help = 'Move closed/expired jobs and their applicants to the archive tables in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Jobs per transaction')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many jobs would be archived')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f'{expired_jobs().count()} job(s) would be archived')
+            return
+
+        jobs = applicants = 0
+        for batch_jobs, batch_applicants in archive_expired(options['batch_size']):
+            jobs += batch_jobs
+            applicants += batch_applicants
+            self.stdout.write(f'Archived {batch_jobs} job(s), {batch_applicants} applicant(s)')
+        self.stdout.write(self.style.SUCCESS(f'Archived {jobs} job(s) and {applicants} applicant(s)'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from jobs import cache
+from jobs.locations import BACKFILL_CHUNK_SIZE, backfill_locations
+from jobs.models import Company, JobPost, Location
+
+
+class Command(BaseCommand):
+    help = 'Map Company.location and JobPost.location strings to normalized Location rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Recompute every row, not only rows without a location_ref')
+        parser.add_argument('--chunk-size', type=int, default=BACKFILL_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        for model in (Company, JobPost):
+            updated = backfill_locations(model, only_missing=not options['all'],
+                                         chunk_size=options['chunk_size'])
+            self.stdout.write(f'{model._meta.verbose_name_plural.capitalize()}: {updated} row(s) linked')
+        # Location filters on cached listings now match more rows
+        cache.bump_generation()
+        self.stdout.write(self.style.SUCCESS(f'{Location.objects.count()} location(s)'))
@@ -0,0 +1,100 @@
+import asyncio
+import statistics
+import time
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+# Same ASGI server, same concurrency; only the views differ
+VARIANTS = [
+    ('sync', 'job_portal.urls'),
+    ('async', 'job_portal.urls_asgi'),
+]
+
+
+def _summary(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    return {
+        'path': label,
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'req_per_s': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(p95 * 1000, 2),
+    }
+
+
+async def _get(application, path):
+    """One GET through the ASGI protocol, as a server would send it. Returns the status."""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': query.encode(), 'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+    }
+    incoming = asyncio.Queue()
+    await incoming.put({'type': 'http.request', 'body': b'', 'more_body': False})
+    status = None
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, incoming.get, send)
+    return status
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the sync views (job_portal.urls) and the async views '
+        '(job_portal.urls_asgi) under the same ASGI handler and the same '
+        'number of requests in flight'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Endpoint to hit, repeatable (default: /api/jobs/ and /)')
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help='Requests in flight, the same for both variants')
+
+    @override_settings(CACHES=NO_CACHE)
+    def handle(self, *args, **options):
+        # The response cache is turned off so both variants do the real work
+        paths = options['paths'] or ['/api/jobs/', '/']
+        for path in paths:
+            for name, urlconf in VARIANTS:
+                result = self.run(name, urlconf, path, options)
+                self.stdout.write(
+                    f"{result['path']:<28} {result['requests']:>6} req "
+                    f"{result['req_per_s']:>8} req/s  p50 {result['p50_ms']:>8} ms  "
+                    f"p95 {result['p95_ms']:>8} ms"
+                )
+
+    def run(self, name, urlconf, path, options):
+        async def main(application):
+            gate = asyncio.Semaphore(options['concurrency'])
+
+            async def one():
+                async with gate:
+                    start = time.perf_counter()
+                    status = await _get(application, path)
+                    assert status == 200, status
+                    return time.perf_counter() - start
+
+            return await asyncio.gather(*(one() for _ in range(options['requests'])))
+
+        with override_settings(ROOT_URLCONF=urlconf):
+            # Sync views run through sync_to_async in a per-request thread,
+            # async views on the event loop, exactly as under uvicorn
+            application = ASGIHandler()
+            start = time.perf_counter()
+            latencies = asyncio.run(main(application))
+            elapsed = time.perf_counter() - start
+        return _summary(f'{name} {path}', latencies, elapsed)
@@ -0,0 +1,150 @@
+import json
+import sys
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from jobs.models import Applicant, ArchivedJobPost, Company, JobPost
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        'Call every job portal endpoint in-process and report p50/p95/p99 latency, '
+        'queries per request and peak memory; optionally write or check a JSON baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--output', help='Write the results as a JSON baseline to this file')
+        parser.add_argument('--compare', help='Fail if results regress against this baseline')
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help='Allowed p95 slowdown against the baseline (0.5 = +50%%)')
+        parser.add_argument('--with-cache', action='store_true',
+                            help='Keep the response cache on (off by default to measure the work)')
+
+    def handle(self, *args, **options):
+        job = JobPost.objects.order_by('-applicant_count').first()
+        company = Company.objects.first()
+        if job is None or company is None:
+            raise CommandError('No data to benchmark, run `manage.py seed_job_portal` first')
+
+        endpoints = self.endpoints(job, company)
+        settings_override = {} if options['with_cache'] else {'CACHES': NO_CACHE}
+
+        # Writes made by the POST endpoints are rolled back afterwards
+        with override_settings(**settings_override), transaction.atomic():
+            results = {name: self.measure(call, options['iterations'])
+                       for name, call in endpoints.items()}
+            transaction.set_rollback(True)
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline written to {options['output']}")
+        if options['compare']:
+            self.compare(results, options['compare'], options['tolerance'])
+
+    def endpoints(self, job, company):
+        client = Client()
+        counter = iter(range(sys.maxsize))
+        emails = list(Applicant.objects.order_by('id').values_list('email', flat=True)[:20])
+        email = emails[0] if emails else 'nobody@example.com'
+        # Where a client that has read the first page of the feed polls from
+        sync_token = client.get('/api/jobs/changes/').json()['next_token']
+        archived = ArchivedJobPost.objects.order_by('id').first()
+
+        def post(path, payload):
+            return lambda: client.post(path, payload(), content_type='application/json')
+
+        endpoints = {
+            'GET /api/jobs/': lambda: client.get('/api/jobs/'),
+            'GET /api/jobs/?location': lambda: client.get('/api/jobs/', {'location': job.location}),
+            'GET /api/jobs/?stream=1': lambda: b''.join(client.get('/api/jobs/', {'stream': 1}).streaming_content),
+            'GET /api/jobs/search/': lambda: client.get('/api/jobs/search/', {'q': job.title.split()[0]}),
+            'GET /api/jobs/<id>/stats/': lambda: client.get(f'/api/jobs/{job.id}/stats/'),
+            'GET /api/applicants/<id>/': lambda: client.get(f'/api/applicants/{job.id}/'),
+            'GET /api/jobs/changes/': lambda: client.get('/api/jobs/changes/'),
+            'GET /api/jobs/changes/?since': lambda: client.get('/api/jobs/changes/', {'since': sync_token}),
+            'GET /api/companies/<id>/dashboard/': lambda: client.get(f'/api/companies/{company.id}/dashboard/'),
+            'GET /api/applications/': lambda: client.get('/api/applications/', {'email': email}),
+            'POST /api/applications/lookup/': post('/api/applications/lookup/', lambda: {'emails': emails}),
+            'GET /api/archive/jobs/': lambda: client.get('/api/archive/jobs/'),
+            'POST /api/apply/': post('/api/apply/', lambda: {
+                'name': 'Bench', 'email': f'bench{next(counter)}@example.com',
+                'resume_link': 'https://example.com/cv', 'job_id': job.id,
+            }),
+            'POST /api/post-job/': post('/api/post-job/', lambda: {
+                'company_id': company.id, 'title': 'Bench role', 'description': 'bench',
+                'salary': 1000, 'location': 'Pune',
+            }),
+            'POST /api/create-company/': post('/api/create-company/', lambda: {
+                'name': 'Bench Co', 'location': 'Pune', 'description': 'bench',
+            }),
+        }
+        if archived is not None:
+            endpoints['GET /api/archive/jobs/<id>/'] = lambda: client.get(f'/api/archive/jobs/{archived.id}/')
+        return endpoints
+
+    def measure(self, call, iterations):
+        call()  # warm up imports and connection
+        latencies = []
+        queries = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                call()
+                latencies.append(time.perf_counter() - start)
+            queries.append(len(captured))
+
+        # tracemalloc slows allocation down a lot, so memory gets its own call
+        tracemalloc.start()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'queries': max(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def report(self, results):
+        self.stdout.write(f"{'endpoint':<36} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+                          f"{'queries':>8} {'peak KB':>9}")
+        for name, r in results.items():
+            self.stdout.write(f"{name:<36} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9} "
+                              f"{r['queries']:>8} {r['peak_kb']:>9}")
+
+    def compare(self, results, path, tolerance):
+        with open(path) as f:
+            baseline = json.load(f)
+
+        regressions = []
+        for name, old in baseline.items():
+            new = results.get(name)
+            if new is None:
+                continue
+            # Query counts are deterministic, any increase is a regression
+            if new['queries'] > old['queries']:
+                regressions.append(f"{name}: queries {old['queries']} -> {new['queries']}")
+            if new['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{name}: p95 {old['p95_ms']} ms -> {new['p95_ms']} ms")
+
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {path}'))
@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+
+from django_common.rows import RowJsonResponse, orjson
+from jobs.models import Applicant, JobPost
+from jobs.views import APPLICANT_ROWS, JOB_ROWS, serialize_job
+
+
+def model_loop_applicants(job_id):
+    # The loop get_applicants used before the row serializers
+    data = []
+    for applicant in Applicant.objects.filter(job_id=job_id):
+        data.append({
+            'id': applicant.id,
+            'name': applicant.name,
+            'email': applicant.email,
+            'resume_link': applicant.resume_link,
+            'applied_at': applicant.applied_at.isoformat()
+        })
+    return JsonResponse({'applicants': data})
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark model-instance serialization loops against the values_list() row serializers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--rows', type=int, default=5000,
+                            help='Number of jobs to serialize per run')
+
+    def best_of(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    def handle(self, *args, **options):
+        limit = options['rows']
+        job = JobPost.objects.order_by('-applicant_count').first()
+        cases = {
+            f'{limit} jobs': (
+                lambda: JsonResponse({'jobs': [
+                    serialize_job(j) for j in JobPost.objects.select_related('company')[:limit]
+                ]}),
+                lambda: RowJsonResponse({'jobs': JOB_ROWS.serialize(JobPost.objects.all()[:limit])}),
+            ),
+        }
+        if job is not None:
+            cases[f'{job.applicant_count} applicants'] = (
+                lambda: model_loop_applicants(job.id),
+                lambda: RowJsonResponse({'applicants': APPLICANT_ROWS.serialize(
+                    Applicant.objects.filter(job_id=job.id))}),
+            )
+
+        self.stdout.write(f"encoder: {'orjson' if orjson else 'json (install orjson for more)'}")
+        for name, (model_loop, row_serializer) in cases.items():
+            before = self.best_of(model_loop, options['repeat'])
+            after = self.best_of(row_serializer, options['repeat'])
+            self.stdout.write(f'{name:<20} model loop {before:9.2f} ms   rows {after:9.2f} ms   '
+                              f'x{before / after:.1f}')
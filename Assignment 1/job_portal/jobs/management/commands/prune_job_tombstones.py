@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.models import JobPostTombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete job tombstones older than the changes feed retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            default=getattr(settings, 'JOBS_TOMBSTONE_RETENTION_DAYS', 30),
+                            help='Keep tombstones this many days (default: JOBS_TOMBSTONE_RETENTION_DAYS)')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = JobPostTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstone(s)'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from jobs import cache
+from jobs.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = 'Recompute the materialized facet counts (FacetCount) from JobPost'
+
+    def handle(self, *args, **options):
+        buckets = rebuild_facets()
+        cache.bump_generation()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {buckets} facet bucket(s)'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from jobs.counters import reconcile_applicant_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount applicants per job and repair any drift in JobPost.applicant_count'
+
+    def handle(self, *args, **options):
+        drifted = reconcile_applicant_counts()
+        for job_id, stored, actual in drifted:
+            self.stdout.write(f'Job {job_id}: {stored} -> {actual}')
+        self.stdout.write(self.style.SUCCESS(f'Fixed {len(drifted)} job(s)'))
@@ -0,0 +1,89 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs import cache, search
+from jobs.locations import resolve_locations
+from jobs.models import Applicant, Company, JobPost
+
+CITIES = ['Pune', 'Delhi', 'Mumbai', 'Bengaluru', 'Hyderabad', 'Chennai', 'Remote']
+ROLES = ['Python Developer', 'Data Engineer', 'Frontend Engineer', 'QA Analyst',
+         'DevOps Engineer', 'Product Manager', 'Legal Associate', 'Designer']
+WORDS = ['django', 'sql', 'api', 'react', 'cloud', 'contracts', 'compliance',
+         'testing', 'python', 'docker', 'analytics', 'design', 'litigation']
+
+
+class Command(BaseCommand):
+    help = 'Seed companies, jobs and applicants with bulk_create from a deterministic RNG'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=100)
+        parser.add_argument('--jobs', type=int, default=5000)
+        parser.add_argument('--applicants', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            # bulk_create skips the pre_save signal that sets location_ref
+            locations = resolve_locations(CITIES)
+            companies = Company.objects.bulk_create([
+                Company(
+                    name=f'Company {i}',
+                    location=(city := rng.choice(CITIES)),
+                    location_ref=locations[city],
+                    description=' '.join(rng.choices(WORDS, k=12)),
+                )
+                for i in range(options['companies'])
+            ], batch_size=batch_size)
+
+            # Skewed applicant spread (a few hot jobs, a long tail), decided
+            # up front so applicant_count is written with the jobs
+            weights = [1 / (rank + 1) for rank in range(options['jobs'])]
+            per_job = [0] * options['jobs']
+            for index in rng.choices(range(options['jobs']), weights=weights, k=options['applicants']):
+                per_job[index] += 1
+
+            jobs = JobPost.objects.bulk_create([
+                JobPost(
+                    company=rng.choice(companies),
+                    title=f'{rng.choice(ROLES)} {i}',
+                    description=' '.join(rng.choices(WORDS, k=40)),
+                    salary=rng.randrange(20000, 300000, 1000),
+                    location=(city := rng.choice(CITIES)),
+                    location_ref=locations[city],
+                    applicant_count=per_job[i],
+                )
+                for i in range(options['jobs'])
+            ], batch_size=batch_size)
+
+            applicants = []
+            created = 0
+            for job, count in zip(jobs, per_job):
+                # Distinct emails per job keep unique_together = ['email', 'job']
+                for person in rng.sample(range(max(count, options['applicants'])), count):
+                    applicants.append(Applicant(
+                        name=f'Candidate {person}',
+                        email=f'candidate{person}@example.com',
+                        resume_link=f'https://example.com/cv/{person}',
+                        job=job,
+                    ))
+                if len(applicants) >= batch_size * 10:
+                    Applicant.objects.bulk_create(applicants, batch_size=batch_size)
+                    created += len(applicants)
+                    applicants = []
+            Applicant.objects.bulk_create(applicants, batch_size=batch_size)
+            created += len(applicants)
+
+            # bulk_create skips the signals that maintain these
+            indexed = search.rebuild_index()
+        cache.bump_generation()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(companies)} companies, {len(jobs)} jobs, '
+            f'{created} applicants ({indexed} jobs indexed for search)'
+        ))
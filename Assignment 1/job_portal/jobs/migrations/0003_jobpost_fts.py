@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_jobpost_fts USING fts5("
+        "title, description, company_name, tokenize='porter unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO jobs_jobpost_fts (rowid, title, description, company_name) "
+        "SELECT j.id, j.title, j.description, c.name "
+        "FROM jobs_jobpost j JOIN jobs_company c ON c.id = j.company_id"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS jobs_jobpost_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_jobpost_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
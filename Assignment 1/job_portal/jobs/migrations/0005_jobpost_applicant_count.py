@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_applicant_count(apps, schema_editor):
+    JobPost = apps.get_model('jobs', 'JobPost')
+    Applicant = apps.get_model('jobs', 'Applicant')
+    counts = (
+        Applicant.objects.filter(job=OuterRef('pk')).order_by()
+        .values('job').annotate(n=Count('id')).values('n')
+    )
+    JobPost.objects.update(applicant_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_applicationticket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='applicant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_applicant_count, migrations.RunPython.noop),
+    ]
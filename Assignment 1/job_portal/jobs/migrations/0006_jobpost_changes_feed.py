@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:35
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Existing jobs count as last changed when they were created
+    JobPost = apps.get_model('jobs', 'JobPost')
+    JobPost.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_jobpost_applicant_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPostTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['updated_at', 'id'], name='jobpost_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposttombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_id_idx'),
+        ),
+    ]
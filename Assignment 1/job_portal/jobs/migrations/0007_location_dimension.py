@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:37
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copy of jobs.locations.location_key as of this migration, so later
+# changes to that module cannot change what this migration does
+_NON_WORD_RE = re.compile(r'[\W_]+')
+BACKFILL_CHUNK_SIZE = 500
+
+
+def location_key(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD_RE.sub(' ', text.casefold()).strip()
+
+
+def backfill_location_ref(apps, schema_editor):
+    # Rows saved before this migration never went through set_location_ref
+    Location = apps.get_model('jobs', 'Location')
+    locations = {}  # key -> id
+    for model_name in ('Company', 'JobPost'):
+        model = apps.get_model('jobs', model_name)
+        last_id = 0
+        while True:
+            chunk = list(model.objects.filter(id__gt=last_id).order_by('id')
+                         .values_list('id', 'location')[:BACKFILL_CHUNK_SIZE])
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+            ids_by_ref = {}
+            for pk, text in chunk:
+                key = location_key(text)
+                if not key:
+                    continue
+                if key not in locations:
+                    locations[key] = Location.objects.get_or_create(
+                        key=key, defaults={'name': text.strip()})[0].id
+                ids_by_ref.setdefault(locations[key], []).append(pk)
+            for ref_id, ids in ids_by_ref.items():
+                model.objects.filter(id__in=ids).update(location_ref_id=ref_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_jobpost_changes_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=200, unique=True)),
+                ('name', models.CharField(max_length=200)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='location_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='companies', to='jobs.location'),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='location_ref',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='jobs.location'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['location_ref', '-created_at'], name='jobpost_location_created_idx'),
+        ),
+        migrations.RunPython(backfill_location_ref, migrations.RunPython.noop),
+    ]
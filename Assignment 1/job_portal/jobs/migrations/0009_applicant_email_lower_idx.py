@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_facetcount'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.OrderBy(models.F('applied_at'), descending=True), name='applicant_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_applicant_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplicant',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('email', models.EmailField(max_length=254)),
+                ('resume_link', models.URLField()),
+                ('applied_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-applied_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedJobPost',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('company_id', models.BigIntegerField()),
+                ('company_name', models.CharField(max_length=200)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('salary', models.IntegerField()),
+                ('location', models.CharField(max_length=200)),
+                ('created_at', models.DateTimeField()),
+                ('closes_at', models.DateTimeField(blank=True, null=True)),
+                ('applicant_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='closes_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', 'id'], name='jobpost_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['closes_at'], name='jobpost_closes_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobpost',
+            index=models.Index(fields=['-created_at', 'id'], name='archivedjob_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobpost',
+            index=models.Index(fields=['company_id', '-created_at'], name='archivedjob_company_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedapplicant',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applicants', to='jobs.archivedjobpost'),
+        ),
+    ]
@@ -1,11 +1,29 @@
 # jobs/models.py
+import uuid
+
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+class Location(models.Model):
+    """Canonical location shared by companies and jobs (see jobs/locations.py)"""
+    key = models.CharField(max_length=200, unique=True)  # location_key() of the text
+    name = models.CharField(max_length=200)  # first spelling seen, for display
+    
+    def __str__(self):
+        return self.name
+    
+    class Meta:
+        ordering = ['name']
+
 class Company(models.Model):
     """Model for companies that post jobs"""
     name = models.CharField(max_length=200)
     location = models.CharField(max_length=200)
+    # Set from location on save; migration 0007 and backfill_locations fill older rows
+    location_ref = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True,
+                                     editable=False, related_name='companies')
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -22,13 +40,56 @@ class JobPost(models.Model):
     description = models.TextField()
     salary = models.IntegerField()
     location = models.CharField(max_length=200)
+    # Indexed through jobpost_location_created_idx below
+    location_ref = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True,
+                                     editable=False, db_index=False, related_name='jobs')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized COUNT of applicants, maintained with F() updates by the
+    # apply paths (see jobs/counters.py) and repaired by reconcile_applicant_counts
+    applicant_count = models.PositiveIntegerField(default=0)
+    # Bumped by every save (not by the F() counter updates); drives /api/jobs/changes/
+    updated_at = models.DateTimeField(auto_now=True)
+    # Lifecycle: listings only show active jobs; archive_expired_jobs moves
+    # jobs past closes_at, or switched off, to the archive tables
+    closes_at = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
     
     def __str__(self):
         return f"{self.title} at {self.company.name}"
     
+    def accepts_applications(self, now=None):
+        return self.is_active and (self.closes_at is None or self.closes_at > (now or timezone.now()))
+    
     class Meta:
         ordering = ['-created_at']  # Most recent first
+        indexes = [
+            # Keyset pagination walks (-created_at, id)
+            models.Index(fields=['-created_at', 'id'], name='jobpost_created_id_idx'),
+            # ... and the public listings only over active jobs
+            models.Index(fields=['-created_at', 'id'], condition=models.Q(is_active=True),
+                         name='jobpost_active_created_idx'),
+            models.Index(fields=['closes_at'], name='jobpost_closes_at_idx'),
+            models.Index(fields=['company', '-created_at'], name='jobpost_company_created_idx'),
+            models.Index(fields=['salary'], name='jobpost_salary_idx'),
+            models.Index(fields=['location_ref', '-created_at'], name='jobpost_location_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='jobpost_updated_id_idx'),
+        ]
+
+class JobPostTombstone(models.Model):
+    """
+    Marker left behind by a deleted JobPost, so the changes feed can tell
+    polling clients to drop it. Pruned by prune_job_tombstones.
+    """
+    job_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Job {self.job_id} deleted {self.deleted_at}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_id_idx'),
+        ]
 
 class Applicant(models.Model):
     """Model for job applicants"""
@@ -43,4 +104,104 @@ class Applicant(models.Model):
     
     class Meta:
         ordering = ['-applied_at']  # Most recent first
-        unique_together = ['email', 'job']  # Prevent duplicate applications
\ No newline at end of file
+        unique_together = ['email', 'job']  # Prevent duplicate applications
+        indexes = [
+            # Case-insensitive "all applications by this person" (/api/applications/)
+            models.Index(Lower('email'), F('applied_at').desc(), name='applicant_email_lower_idx'),
+        ]
+
+class ApplicationTicket(models.Model):
+    """
+    Queued job application (write-behind ingestion mode).
+    apply_job stores the raw submission here and returns at once;
+    the process_application_queue command turns pending tickets into
+    Applicant rows in batches.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_ACCEPTED = 'accepted'
+    STATUS_REJECTED = 'rejected'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_ACCEPTED, 'Accepted'),
+        (STATUS_REJECTED, 'Rejected'),
+    ]
+
+    ticket = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    name = models.CharField(max_length=200)
+    email = models.EmailField()
+    resume_link = models.URLField()
+    job_id = models.BigIntegerField()  # checked by the worker, not at enqueue time
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    applicant = models.ForeignKey(Applicant, on_delete=models.SET_NULL, null=True, blank=True,
+                                  related_name='+')
+    error = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.ticket} ({self.status})"
+
+    class Meta:
+        indexes = [
+            # The worker scans pending tickets in arrival order
+            models.Index(fields=['status', 'id'], name='ticket_status_id_idx'),
+        ]
+
+class FacetCount(models.Model):
+    """
+    Materialized facet bucket for the unfiltered job listing (see jobs/facets.py).
+    bucket is the location/company id as text, or the salary band label.
+    """
+    facet = models.CharField(max_length=20)
+    bucket = models.CharField(max_length=200)
+    label = models.CharField(max_length=200)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.facet}={self.label}: {self.count}"
+
+    class Meta:
+        unique_together = ['facet', 'bucket']
+
+class ArchivedJobPost(models.Model):
+    """
+    Cold copy of an expired JobPost, written by archive_expired_jobs.
+    Keeps the original id; the company is a snapshot, not a foreign key,
+    so archived rows outlive their company.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    company_id = models.BigIntegerField()
+    company_name = models.CharField(max_length=200)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    salary = models.IntegerField()
+    location = models.CharField(max_length=200)
+    created_at = models.DateTimeField()
+    closes_at = models.DateTimeField(null=True, blank=True)
+    applicant_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.title} at {self.company_name} (archived)"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='archivedjob_created_id_idx'),
+            models.Index(fields=['company_id', '-created_at'], name='archivedjob_company_idx'),
+        ]
+
+class ArchivedApplicant(models.Model):
+    """Cold copy of an Applicant of an archived job, original id kept"""
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJobPost, on_delete=models.CASCADE, related_name='applicants')
+    name = models.CharField(max_length=200)
+    email = models.EmailField()
+    resume_link = models.URLField()
+    applied_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} - {self.job.title} (archived)"
+
+    class Meta:
+        ordering = ['-applied_at']
@@ -0,0 +1,152 @@
+# jobs/search.py
+"""
+Full-text search over job postings.
+
+On SQLite the index is an FTS5 virtual table (created by migration 0003)
+whose rowid is the JobPost id. It is kept in sync by the signal handlers
+in jobs/signals.py and can be rebuilt from scratch with
+`python manage.py rebuild_job_search_index`. Other databases fall back to
+icontains filters so the endpoint keeps working.
+"""
+import re
+
+from django.db import connection, connections, router
+from django.db.models import Q
+from django.utils import timezone
+
+from .filters import open_jobs
+from .models import JobPost
+
+FTS_TABLE = 'jobs_jobpost_fts'
+
+# bm25() column weights for (title, description, company_name)
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """
+    Turn free user input into a safe FTS5 MATCH expression: every word is
+    quoted (so operators and punctuation cannot break the query) and the
+    last one is a prefix match for search-as-you-type.
+    """
+    terms = _TERM_RE.findall(text)
+    if not terms:
+        return ''
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_jobs(text, limit):
+    """Return [(job, score)] best match first, higher score is better"""
+    if not fts_enabled():
+        return _search_jobs_fallback(text, limit)
+
+    match = build_match_query(text)
+    if not match:
+        return []
+
+    weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+    now = timezone.now()
+    db = connections[router.db_for_read(JobPost)]
+    with db.cursor() as cursor:
+        # The open_jobs() condition runs before the LIMIT, so closed and
+        # expired jobs that are still indexed cannot use up the page
+        cursor.execute(
+            f'SELECT {FTS_TABLE}.rowid, bm25({FTS_TABLE}, {weights}) AS rank '
+            f'FROM {FTS_TABLE} JOIN jobs_jobpost j ON j.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND j.is_active '
+            f'AND (j.closes_at IS NULL OR j.closes_at > %s) '
+            f'ORDER BY rank LIMIT %s',
+            [match, db.ops.adapt_datetimefield_value(now), limit]
+        )
+        hits = cursor.fetchall()
+
+    jobs = open_jobs(JobPost.objects.select_related('company'), now).in_bulk([pk for pk, _ in hits])
+    # bm25() is "lower is better", flip it so clients can sort descending
+    return [(jobs[pk], -rank) for pk, rank in hits if pk in jobs]
+
+
+def _search_jobs_fallback(text, limit):
+    query = Q()
+    for term in _TERM_RE.findall(text):
+        query &= (Q(title__icontains=term) | Q(description__icontains=term) |
+                  Q(company__name__icontains=term))
+    if not query:
+        return []
+    jobs = open_jobs(JobPost.objects.select_related('company').filter(query))[:limit]
+    return [(job, None) for job in jobs]
+
+
+def index_job(job_id, title, description, company_name):
+    """Insert or replace one job's row in the index"""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, company_name) '
+            f'VALUES (%s, %s, %s, %s)',
+            [job_id, title, description, company_name]
+        )
+
+
+def index_jobs(rows):
+    """Index many new jobs at once, rows are (id, title, description, company_name)"""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, company_name) '
+            f'VALUES (%s, %s, %s, %s)',
+            list(rows)
+        )
+
+
+def unindex_job(job_id):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
+
+
+def unindex_jobs(job_ids):
+    """Drop many jobs from the index at once"""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[pk] for pk in job_ids])
+
+
+def rename_company(company_id, name):
+    """Refresh company_name on every indexed job of a company"""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {FTS_TABLE} SET company_name = %s WHERE rowid IN '
+            f'(SELECT id FROM jobs_jobpost WHERE company_id = %s)',
+            [name, company_id]
+        )
+
+
+def rebuild_index():
+    """Drop every indexed row and re-read all jobs, returns the row count"""
+    if not fts_enabled():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, company_name) '
+            f'SELECT j.id, j.title, j.description, c.name '
+            f'FROM jobs_jobpost j JOIN jobs_company c ON c.id = j.company_id'
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
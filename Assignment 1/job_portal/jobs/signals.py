@@ -0,0 +1,116 @@
+# jobs/signals.py
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import cache, facets, search
+from .locations import location_key, resolve_location
+from .models import Company, JobPost, JobPostTombstone
+
+
+# The remember_* receivers snapshot the stored row before the save, so
+# they are connected ahead of set_location_ref, which reads the snapshot
+
+@receiver(pre_save, sender=Company)
+def remember_company(sender, instance, raw=False, **kwargs):
+    """Only a rename touches the company's jobs, only a move its Location"""
+    instance._old_name = instance._old_location = None
+    if raw or instance.pk is None:
+        return
+    old = Company.objects.filter(pk=instance.pk).values_list('name', 'location').first()
+    if old:
+        instance._old_name, instance._old_location = old
+
+
+@receiver(pre_save, sender=JobPost)
+def remember_job(sender, instance, raw=False, **kwargs):
+    """An edit moves the job out of the buckets it was counted in before"""
+    instance._old_location = instance._facet_buckets = None
+    if raw or instance.pk is None:
+        return
+    old = (JobPost.objects.filter(pk=instance.pk)
+           .values_list('location', 'location_ref_id', 'location_ref__name', 'company_id',
+                        'company__name', 'salary', 'is_active').first())
+    if old is None:
+        return
+    instance._old_location = old[0]
+    if facets.materialized_enabled():
+        instance._facet_buckets = facets.job_buckets(*old[1:])
+
+
+@receiver(pre_save, sender=Company)
+@receiver(pre_save, sender=JobPost)
+def set_location_ref(sender, instance, raw=False, **kwargs):
+    """Point the row at the Location matching its location text"""
+    if raw:
+        return
+    old = getattr(instance, '_old_location', None)
+    if (old is not None and instance.location_ref_id is not None
+            and location_key(old) == location_key(instance.location)):
+        return
+    instance.location_ref = resolve_location(instance.location)
+
+
+@receiver(post_save, sender=JobPost)
+def index_job_post(sender, instance, raw=False, **kwargs):
+    """Keep the full-text index in step with saved jobs"""
+    if raw:
+        return
+    search.index_job(instance.id, instance.title, instance.description,
+                     instance.company.name)
+
+
+@receiver(post_delete, sender=JobPost)
+def unindex_job_post(sender, instance, **kwargs):
+    search.unindex_job(instance.id)
+
+
+@receiver(post_delete, sender=JobPost)
+def record_job_tombstone(sender, instance, **kwargs):
+    """Deleted jobs leave a tombstone for the changes feed"""
+    JobPostTombstone.objects.create(job_id=instance.id)
+
+
+@receiver(post_save, sender=JobPost)
+def count_job_facets(sender, instance, created, raw=False, **kwargs):
+    if raw or not facets.materialized_enabled():
+        return
+    location = instance.location_ref
+    buckets = facets.job_buckets(location.id if location else None, location.name if location else None,
+                                 instance.company_id, instance.company.name, instance.salary,
+                                 instance.is_active)
+    deltas = Counter({key: 1 for key in buckets})
+    for key in getattr(instance, '_facet_buckets', None) or ():
+        deltas[key] -= 1
+    facets.apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=JobPost)
+def uncount_job_facets(sender, instance, **kwargs):
+    if facets.materialized_enabled():
+        # Labels are only used when creating buckets, the ids are enough here
+        facets.record_jobs([facets.job_buckets(instance.location_ref_id, None, instance.company_id,
+                                               None, instance.salary, instance.is_active)], delta=-1)
+
+
+@receiver(post_save, sender=Company)
+def reindex_company_jobs(sender, instance, created, raw=False, **kwargs):
+    """A renamed company changes what its jobs match on"""
+    if raw or created or getattr(instance, '_old_name', None) == instance.name:
+        return
+    search.rename_company(instance.id, instance.name)
+    # Jobs embed the company name, so they show up in the changes feed again
+    JobPost.objects.filter(company_id=instance.id).update(updated_at=timezone.now())
+    if facets.materialized_enabled():
+        facets.rename_bucket('company', instance.id, instance.name)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=JobPost)
+@receiver(post_delete, sender=JobPost)
+def invalidate_job_listings(sender, **kwargs):
+    """Any company/job write (views, admin, shell) makes cached listings stale"""
+    cache.bump_generation()
@@ -0,0 +1,103 @@
+# jobs/streaming.py
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+
+from django_common.rows import dumps
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+CHUNK_SIZE = 500
+
+
+def stream_format(request):
+    """
+    Which streaming mode the client asked for, if any:
+    'ndjson' for ?stream=ndjson or an NDJSON Accept header,
+    'json' for ?stream=1, otherwise None.
+    """
+    stream = request.GET.get('stream', '').lower()
+    if stream == 'ndjson' or NDJSON_CONTENT_TYPE in request.headers.get('Accept', ''):
+        return 'ndjson'
+    if stream in ('1', 'true', 'json'):
+        return 'json'
+    return None
+
+
+async def aiterate(queryset, chunk_size=CHUNK_SIZE):
+    """
+    queryset.aiterator() that also works for values_list() querysets.
+    Django's aiterator() creates the row iterable inside the event loop,
+    and for values_list() that already runs the query (SynchronousOnlyOperation).
+    Here the iterator is only advanced on the ORM thread, one chunk per hop.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    while True:
+        chunk = await next_chunk()
+        if not chunk:
+            return
+        for row in chunk:
+            yield row
+
+
+def _dumps(obj):
+    return dumps(obj).decode()
+
+
+def _ndjson_rows(rows, serialize):
+    for row in rows:
+        yield _dumps(serialize(row)) + '\n'
+
+
+def _json_document(rows, serialize, key, total_key, header):
+    """
+    Write {"<header keys>": ..., "<key>": [rows...], "<total_key>": n}
+    one row at a time, the count goes last since it is only known at the end.
+    """
+    prefix = _dumps(header)[:-1]
+    yield (prefix + ', ' if header else '{') + f'"{key}": ['
+    total = 0
+    for row in rows:
+        yield (', ' if total else '') + _dumps(serialize(row))
+        total += 1
+    yield f'], "{total_key}": {total}}}'
+
+
+async def _ndjson_rows_async(rows, serialize):
+    async for row in rows:
+        yield _dumps(serialize(row)) + '\n'
+
+
+async def _json_document_async(rows, serialize, key, total_key, header):
+    prefix = _dumps(header)[:-1]
+    yield (prefix + ', ' if header else '{') + f'"{key}": ['
+    total = 0
+    async for row in rows:
+        yield (', ' if total else '') + _dumps(serialize(row))
+        total += 1
+    yield f'], "{total_key}": {total}}}'
+
+
+def streaming_response(fmt, queryset, serialize, key, total_key='total', header=None):
+    """
+    Stream a queryset as NDJSON or as a single JSON document. Rows are
+    pulled from the database CHUNK_SIZE at a time with .iterator(), so
+    memory stays flat however many rows match.
+    """
+    rows = queryset.iterator(chunk_size=CHUNK_SIZE)
+    if fmt == 'ndjson':
+        return StreamingHttpResponse(_ndjson_rows(rows, serialize),
+                                     content_type=NDJSON_CONTENT_TYPE)
+    return StreamingHttpResponse(_json_document(rows, serialize, key, total_key, header or {}),
+                                 content_type='application/json')
+
+
+def async_streaming_response(fmt, queryset, serialize, key, total_key='total', header=None):
+    """streaming_response for async views, rows come from aiterate()"""
+    rows = aiterate(queryset)
+    if fmt == 'ndjson':
+        return StreamingHttpResponse(_ndjson_rows_async(rows, serialize),
+                                     content_type=NDJSON_CONTENT_TYPE)
+    return StreamingHttpResponse(_json_document_async(rows, serialize, key, total_key, header or {}),
+                                 content_type='application/json')
@@ -1,3 +1,911 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from django_common import rows
+from django_common.pagination import encode_token
+from django_common.db_routing import PrimaryReplicaRouter, ReadReplicaMiddleware
+from django_common.sql_instrumentation import (
+    QueryBudgetExceeded, QueryRecorder, SQLInstrumentationMiddleware, statement_template,
+)
+
+from . import archive, cache, facets
+from .admin_tools import EstimatedCountPaginator
+from .counters import reconcile_applicant_counts
+from .locations import location_key
+from .models import (
+    Location, Company, JobPost, JobPostTombstone, Applicant, ApplicationTicket, ArchivedJobPost,
+)
+from .views import JOB_FIELDS, serialize_job
+
+
+class JobPortalTestCase(TestCase):
+    """Shared fixtures: two companies with a handful of jobs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.acme = Company.objects.create(name='Acme', location='Pune', description='Widgets')
+        cls.globex = Company.objects.create(name='Globex', location='Delhi', description='Gadgets')
+        cls.jobs = []
+        for i in range(5):
+            cls.jobs.append(JobPost.objects.create(
+                company=cls.acme if i % 2 == 0 else cls.globex,
+                title=f'Engineer {i}',
+                description='Write code',
+                salary=1000 * (i + 1),
+                location='Pune' if i % 2 == 0 else 'Delhi',
+            ))
+
+    def setUp(self):
+        # Cached pages would otherwise outlive each test's rolled-back data
+        cache.get_cache().clear()
+
+
+class GetJobsTests(JobPortalTestCase):
+
+    def test_cursor_walks_every_job_once(self):
+        seen = []
+        cursor = ''
+        while True:
+            response = self.client.get('/api/jobs/', {'limit': 2, 'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            seen.extend(job['id'] for job in data['jobs'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(sorted(seen), sorted(job.id for job in self.jobs))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_filters_run_in_database(self):
+        response = self.client.get('/api/jobs/', {
+            'location': 'pune', 'salary_min': 2000, 'company_id': self.acme.id,
+        })
+        titles = {job['title'] for job in response.json()['jobs']}
+        self.assertEqual(titles, {'Engineer 2', 'Engineer 4'})
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get('/api/jobs/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class StreamingTests(JobPortalTestCase):
+
+    def test_stream_json_matches_regular_shape(self):
+        response = self.client.get('/api/jobs/', {'stream': 1})
+        self.assertTrue(response.streaming)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(data['total'], len(self.jobs))
+        self.assertEqual(len(data['jobs']), len(self.jobs))
+
+    def test_stream_ndjson_applicants(self):
+        job = self.jobs[0]
+        for i in range(3):
+            Applicant.objects.create(name=f'A{i}', email=f'a{i}@example.com',
+                                     resume_link='https://example.com/cv', job=job)
+        response = self.client.get(f'/api/applicants/{job.id}/',
+                                   HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual({json.loads(line)['email'] for line in lines},
+                         {'a0@example.com', 'a1@example.com', 'a2@example.com'})
+
+
+class SearchTests(JobPortalTestCase):
+
+    def test_search_ranks_title_matches(self):
+        JobPost.objects.create(company=self.acme, title='Python developer',
+                               description='Django APIs', salary=5000, location='Pune')
+        JobPost.objects.create(company=self.globex, title='Designer',
+                               description='Occasional python scripting', salary=4000, location='Delhi')
+        response = self.client.get('/api/jobs/search/', {'q': 'python'})
+        titles = [job['title'] for job in response.json()['jobs']]
+        self.assertEqual(titles, ['Python developer', 'Designer'])
+
+    def test_index_follows_company_rename_and_delete(self):
+        self.acme.name = 'Initech'
+        self.acme.save()
+        response = self.client.get('/api/jobs/search/', {'q': 'initech'})
+        self.assertEqual(response.json()['total'], 3)
+
+        self.jobs[0].delete()
+        response = self.client.get('/api/jobs/search/', {'q': 'initech'})
+        self.assertEqual(response.json()['total'], 2)
+
+    def test_closed_matches_do_not_use_up_the_limit(self):
+        past = timezone.now() - timezone.timedelta(minutes=1)
+        for i in range(3):
+            # Better matches than the open "Engineer n" jobs
+            JobPost.objects.create(company=self.acme, title='Engineer engineer', description='engineer',
+                                   salary=100, location='Pune', is_active=i != 0,
+                                   closes_at=past if i else None)
+        response = self.client.get('/api/jobs/search/', {'q': 'engineer', 'limit': 2})
+        ids = [job['id'] for job in response.json()['jobs']]
+        self.assertEqual(len(ids), 2)
+        self.assertTrue(set(ids) <= {job.id for job in self.jobs})
+
+    def test_operators_in_query_are_harmless(self):
+        response = self.client.get('/api/jobs/search/', {'q': 'engineer" OR NEAR('})
+        self.assertEqual(response.status_code, 200)
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command('rebuild_job_search_index', stdout=out)
+        self.assertIn('Indexed 5 job posts', out.getvalue())
+
+
+class BulkPostTests(JobPortalTestCase):
+
+    def job(self, **overrides):
+        data = {'company_id': self.acme.id, 'title': 'Bulk role', 'description': 'd',
+                'salary': 100, 'location': 'Pune'}
+        data.update(overrides)
+        return data
+
+    def test_reports_errors_per_item(self):
+        items = [self.job(), self.job(salary=-1), self.job(company_id=999999), self.job()]
+        # company lookup, location lookup, savepoint, one INSERT, one FTS executemany, release
+        with self.assertNumQueries(6):
+            response = self.client.post('/api/post-jobs/bulk/', items,
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 207)
+        data = response.json()
+        self.assertEqual([c['index'] for c in data['created']], [0, 3])
+        self.assertEqual(data['errors'], [
+            {'index': 1, 'error': 'Salary must be positive'},
+            {'index': 2, 'error': 'Company not found'},
+        ])
+        search = self.client.get('/api/jobs/search/', {'q': 'bulk'}).json()
+        self.assertEqual(search['total'], 2)
+
+    def test_ndjson_body(self):
+        body = '\n'.join(json.dumps(self.job(title=f'Role {i}')) for i in range(300))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/post-jobs/bulk/', body,
+                                        content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        # 11 columns per row: at most 90 rows fit under SQLite's 999 parameters
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "jobs_jobpost"')]
+        self.assertEqual(len(inserts), 4)
+        self.assertEqual(JobPost.objects.filter(title__startswith='Role ').count(), 300)
+
+
+class ResponseCacheTests(JobPortalTestCase):
+
+    def test_second_read_is_served_from_cache(self):
+        self.assertEqual(self.client.get('/api/jobs/')['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/jobs/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()['total'], 5)
+
+    def test_post_job_invalidates(self):
+        self.client.get('/api/jobs/')
+        self.client.post('/api/post-job/', {
+            'company_id': self.acme.id, 'title': 'Fresh', 'description': 'd',
+            'salary': 10, 'location': 'Pune',
+        }, content_type='application/json')
+        response = self.client.get('/api/jobs/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['jobs'][0]['title'], 'Fresh')
+
+    def test_write_bumps_again_on_commit(self):
+        # A page cached from the pre-commit rows between the first bump and
+        # the commit must not survive it
+        before = cache.current_generation()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.acme.save()
+            self.assertEqual(cache.current_generation(), before + 1)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(cache.current_generation(), before + 2)
+
+    @override_settings(JOBS_CACHE_MAX_BYTES=10)
+    def test_large_bodies_are_not_cached(self):
+        self.client.get('/api/jobs/')
+        self.assertEqual(self.client.get('/api/jobs/')['X-Cache'], 'MISS')
+
+
+class ConditionalGetTests(JobPortalTestCase):
+
+    def test_matching_etag_returns_304_without_body(self):
+        etag = self.client.get('/api/jobs/')['ETag']
+        with self.assertNumQueries(0):  # validators are cached per generation
+            response = self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_new_applicant_changes_etag(self):
+        job = self.jobs[0]
+        url = f'/api/applicants/{job.id}/'
+        Applicant.objects.create(name='A', email='a@example.com',
+                                 resume_link='https://example.com/cv', job=job)
+        first = self.client.get(url)
+        self.assertNotIn('Last-Modified', first)  # deletes would not move it
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        Applicant.objects.create(name='B', email='b@example.com',
+                                 resume_link='https://example.com/cv', job=job)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_applicants'], 2)
+
+    def test_edits_and_deletes_move_last_modified(self):
+        def revalidate():
+            # Backdate every change so the next one lands in a later second
+            JobPost.objects.update(updated_at=timezone.now() - timezone.timedelta(hours=1))
+            JobPostTombstone.objects.update(deleted_at=timezone.now() - timezone.timedelta(hours=1))
+            cache.bump_generation()
+            since = self.client.get('/api/jobs/')['Last-Modified']
+            self.assertEqual(self.client.get('/api/jobs/', HTTP_IF_MODIFIED_SINCE=since).status_code, 304)
+            return since
+
+        since = revalidate()
+        self.jobs[1].title = 'Renamed'
+        self.jobs[1].save()
+        self.assertEqual(self.client.get('/api/jobs/', HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+        since = revalidate()
+        self.jobs[2].delete()
+        self.assertEqual(self.client.get('/api/jobs/', HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+    def test_applicants_of_missing_job_is_404(self):
+        self.assertEqual(self.client.get('/api/applicants/999999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/applicants/999999/', HTTP_IF_NONE_MATCH='*').status_code, 404)
+
+    def test_job_edit_changes_etag(self):
+        etag = self.client.get('/api/jobs/')['ETag']
+        self.jobs[1].title = 'Renamed'
+        self.jobs[1].save()
+        response = self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(JOBS_QUEUE_APPLICATIONS=True)
+class ApplicationQueueTests(JobPortalTestCase):
+
+    def apply(self, email, job_id):
+        return self.client.post('/api/apply/', {
+            'name': 'Asha', 'email': email, 'resume_link': 'https://example.com/cv',
+            'job_id': job_id,
+        }, content_type='application/json')
+
+    def test_queued_applications_are_flushed_in_one_batch(self):
+        job = self.jobs[0]
+        Applicant.objects.create(name='Old', email='old@example.com',
+                                 resume_link='https://example.com/cv', job=job)
+        tickets = [
+            self.apply('new@example.com', job.id),
+            self.apply('new@example.com', job.id),   # duplicate inside the batch
+            self.apply('old@example.com', job.id),   # already applied
+            self.apply('x@example.com', 999999),     # unknown job
+        ]
+        self.assertEqual({t.status_code for t in tickets}, {202})
+        self.assertEqual(Applicant.objects.count(), 1)
+
+        call_command('process_application_queue', stdout=StringIO())
+
+        statuses = [self.client.get(t.json()['status_url']).json() for t in tickets]
+        self.assertEqual([s['status'] for s in statuses],
+                         ['accepted', 'rejected', 'rejected', 'rejected'])
+        self.assertEqual(statuses[3]['error'], 'Job not found')
+        self.assertEqual(Applicant.objects.filter(email='new@example.com').count(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.applicant_count, 1)  # 'Old' was inserted behind the counter's back
+        self.assertFalse(ApplicationTicket.objects.filter(status='pending').exists())
+
+
+class ApplicantCounterTests(JobPortalTestCase):
+
+    def test_apply_increments_and_stats_skip_applicant_table(self):
+        job = self.jobs[0]
+        for email in ['a@example.com', 'b@example.com', 'a@example.com']:
+            self.client.post('/api/apply/', {
+                'name': 'A', 'email': email, 'resume_link': 'https://example.com/cv',
+                'job_id': job.id,
+            }, content_type='application/json')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/jobs/{job.id}/stats/')
+        self.assertEqual(response.json()['applicant_count'], 2)
+        self.assertNotIn('jobs_applicant', queries[0]['sql'])
+
+        listing = self.client.get('/api/jobs/', {'include': 'applicant_count'}).json()
+        counts = {j['id']: j['applicant_count'] for j in listing['jobs']}
+        self.assertEqual(counts[job.id], 2)
+
+    def test_job_delete_cascades_applicants_in_constant_queries(self):
+        def delete_job_with(n):
+            job = JobPost.objects.create(company=self.acme, title='Temp', description='x',
+                                         salary=1, location='Pune')
+            Applicant.objects.bulk_create([
+                Applicant(name='A', email=f'a{i}@example.com', resume_link='https://example.com/cv', job=job)
+                for i in range(n)
+            ])
+            with CaptureQueriesContext(connection) as queries:
+                job.delete()
+            return len(queries)
+
+        # Applicant ids, ticket unlink, applicant DELETE, job DELETE, FTS row, tombstone
+        self.assertEqual(delete_job_with(50), 6)
+        self.assertEqual(delete_job_with(2), 6)
+
+    def test_admin_delete_decrements_counter(self):
+        job = self.jobs[0]
+        for email in ['a@example.com', 'b@example.com', 'c@example.com']:
+            self.client.post('/api/apply/', {
+                'name': 'A', 'email': email, 'resume_link': 'https://example.com/cv', 'job_id': job.id,
+            }, content_type='application/json')
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pass12345')
+        self.client.force_login(admin_user)
+        ids = list(Applicant.objects.filter(job=job).values_list('id', flat=True)[:2])
+        self.client.post('/admin/jobs/applicant/', {
+            'action': 'delete_selected', '_selected_action': ids, 'post': 'yes',
+        })
+        job.refresh_from_db()
+        self.assertEqual(job.applicant_count, 1)
+        self.assertEqual(reconcile_applicant_counts(), [])
+
+    def test_admin_add_and_move_keep_counters(self):
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pass12345')
+        self.client.force_login(admin_user)
+        first, second = self.jobs[0], self.jobs[1]
+        form = {'name': 'A', 'email': 'a@example.com', 'resume_link': 'https://example.com/cv'}
+        response = self.client.post('/admin/jobs/applicant/add/', {**form, 'job': first.id})
+        self.assertEqual(response.status_code, 302)
+        applicant = Applicant.objects.get(email='a@example.com')
+        self.client.post(f'/admin/jobs/applicant/{applicant.id}/change/', {**form, 'job': second.id})
+        self.client.post(f'/admin/jobs/applicant/{applicant.id}/change/', {**form, 'name': 'B',
+                                                                            'job': second.id})
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.applicant_count, second.applicant_count), (0, 1))
+        self.assertEqual(Applicant.objects.get(id=applicant.id).name, 'B')
+        self.assertEqual(reconcile_applicant_counts(), [])
+
+    def test_reconcile_repairs_drift(self):
+        job = self.jobs[1]
+        Applicant.objects.create(name='A', email='a@example.com',
+                                 resume_link='https://example.com/cv', job=job)
+        JobPost.objects.filter(id=self.jobs[2].id).update(applicant_count=7)
+        call_command('reconcile_applicant_counts', stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.applicant_count, 1)
+        self.assertEqual(JobPost.objects.get(id=self.jobs[2].id).applicant_count, 0)
+
+
+@override_settings(ROOT_URLCONF='job_portal.urls_asgi')
+class AsyncViewTests(JobPortalTestCase):
+
+    async def test_async_jobs_match_sync_shape(self):
+        response = await self.async_client.get('/api/jobs/', {'limit': 2})
+        data = response.json()
+        self.assertEqual(len(data['jobs']), 2)
+        self.assertIsNotNone(data['next_cursor'])
+        response = await self.async_client.get('/api/jobs/', {'cursor': data['next_cursor']})
+        self.assertEqual(response.json()['total'], 3)
+
+    async def test_async_facets(self):
+        response = await self.async_client.get('/api/jobs/', {'facets': 'company', 'location': 'Pune'})
+        self.assertEqual(response.json()['facets']['company'],
+                         [{'id': self.acme.id, 'name': 'Acme', 'count': 3}])
+
+    async def test_async_applicants_and_streams_read_rows(self):
+        job = self.jobs[0]
+        await Applicant.objects.acreate(name='A', email='a@example.com',
+                                        resume_link='https://example.com/cv', job=job)
+        response = await self.async_client.get(f'/api/applicants/{job.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_applicants'], 1)
+        response = await self.async_client.get('/api/jobs/', {'stream': 'ndjson'})
+        lines = b''.join([chunk async for chunk in response.streaming_content]).splitlines()
+        self.assertEqual(len(lines), 5)
+
+    async def test_async_applicants_404(self):
+        response = await self.async_client.get('/api/applicants/999999/')
+        self.assertEqual(response.status_code, 404)
+
+
+class SeedAndBenchmarkTests(TestCase):
+
+    def test_asgi_benchmark_runs_both_variants_through_one_handler(self):
+        out = StringIO()
+        call_command('benchmark_asgi', requests=6, concurrency=3, paths=['/'], stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ['sync', 'async'])
+        self.assertTrue(all(' 6 req ' in line for line in lines))
+
+    def test_seed_is_deterministic_and_benchmark_checks_baseline(self):
+        call_command('seed_job_portal', companies=3, jobs=20, applicants=200, stdout=StringIO())
+        self.assertEqual(Applicant.objects.count(), 200)
+        first = list(JobPost.objects.order_by('id').values_list('title', 'salary', 'applicant_count'))
+        self.assertFalse(reconcile_applicant_counts())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = os.path.join(tmp, 'baseline.json')
+            call_command('benchmark_endpoints', iterations=2, output=baseline, stdout=StringIO())
+            with open(baseline) as f:
+                results = json.load(f)
+            self.assertEqual(results['GET /api/jobs/<id>/stats/']['queries'], 1)
+            for name in ['GET /api/jobs/changes/?since', 'GET /api/companies/<id>/dashboard/',
+                         'GET /api/applications/', 'POST /api/applications/lookup/',
+                         'GET /api/archive/jobs/']:
+                self.assertIn(name, results)
+
+            results['GET /api/jobs/']['queries'] = 0
+            with open(baseline, 'w') as f:
+                json.dump(results, f)
+            with self.assertRaisesMessage(CommandError, 'GET /api/jobs/: queries 0 -> '):
+                call_command('benchmark_endpoints', iterations=2, compare=baseline, stdout=StringIO())
+
+        JobPost.objects.all().delete()
+        Company.objects.all().delete()
+        call_command('seed_job_portal', companies=3, jobs=20, applicants=200, stdout=StringIO())
+        again = list(JobPost.objects.order_by('id').values_list('title', 'salary', 'applicant_count'))
+        self.assertEqual(first, again)
+
+
+class SQLInstrumentationTests(JobPortalTestCase):
+
+    def test_headers_report_queries(self):
+        response = self.client.get(f'/api/jobs/{self.jobs[0].id}/stats/')
+        self.assertEqual(response['X-DB-Query-Count'], '1')
+        self.assertTrue(response['Server-Timing'].startswith('db;dur='))
+        self.assertEqual(response['X-DB-Repeated-Queries'], '0')
+
+    @override_settings(ROOT_URLCONF='job_portal.urls_asgi')
+    def test_asgi_chain_stays_async(self):
+        from asgiref.sync import iscoroutinefunction
+        from django.conf import settings
+        from django.core.handlers.asgi import ASGIHandler
+        middleware = list(settings.MIDDLEWARE)
+        middleware.insert(1, 'django_common.db_routing.ReadReplicaMiddleware')
+        with self.settings(MIDDLEWARE=middleware):
+            chain = ASGIHandler()._middleware_chain
+        self.assertTrue(iscoroutinefunction(chain))
+        # ... because the middleware run async, not because Django wrapped a sync chain
+        outer = chain.__wrapped__
+        self.assertIsInstance(outer, SQLInstrumentationMiddleware)
+        self.assertTrue(iscoroutinefunction(outer))
+        self.assertIsInstance(outer.get_response.__wrapped__, ReadReplicaMiddleware)
+        self.assertTrue(iscoroutinefunction(outer.get_response))
+
+    @override_settings(ROOT_URLCONF='job_portal.urls_asgi')
+    async def test_async_views_are_recorded(self):
+        response = await self.async_client.get('/api/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-DB-Query-Count'], '1')  # the page, run on the ORM's thread
+
+    def test_streamed_queries_are_recorded_through_the_body(self):
+        response = self.client.get(f'/api/applicants/{self.jobs[0].id}/', {'stream': 'ndjson'})
+        self.assertNotIn('X-DB-Query-Count', response)  # would only cover the pre-body queries
+        with self.assertLogs('sql_instrumentation', 'DEBUG') as logs:
+            b''.join(response.streaming_content)
+        self.assertRegex(logs.output[-1], r'streamed: [1-9]\d* queries')
+
+    async def test_sync_streams_are_not_buffered_under_asgi(self):
+        job = self.jobs[0]
+        for i in range(2):
+            await Applicant.objects.acreate(name=f'A{i}', email=f'a{i}@example.com',
+                                            resume_link='https://example.com/cv', job=job)
+        response = await self.async_client.get(f'/api/applicants/{job.id}/', {'stream': 'ndjson'})
+        # Left sync, StreamingHttpResponse.__aiter__ would list() the whole body first
+        self.assertTrue(response.is_async)
+        with self.assertLogs('sql_instrumentation', 'DEBUG') as logs:
+            body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), 2)
+        self.assertRegex(logs.output[-1], r'streamed: [1-9]\d* queries')
+
+    def test_repeated_templates_are_flagged(self):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for job in JobPost.objects.all():
+                Company.objects.get(id=job.company_id)
+        repeated = recorder.repeated(5)
+        self.assertEqual(len(repeated), 1)
+        self.assertIn('WHERE "jobs_company"."id" = %s', repeated[0][0])
+        self.assertEqual(statement_template("SELECT 1 WHERE a IN (%s, %s, %s) AND b = 'x'"),
+                         'SELECT ? WHERE a IN (...) AND b = ?')
+
+    @override_settings(SQL_INSTRUMENTATION={'QUERY_COUNT_WARNING': 0, 'RAISE': True})
+    def test_budget_can_raise_in_tests(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(f'/api/jobs/{self.jobs[0].id}/stats/')
+
+
+class RowSerializerTests(JobPortalTestCase):
+
+    def test_rows_match_model_serialization(self):
+        expected = [serialize_job(job) for job in JobPost.objects.select_related('company')]
+        for encoder in [rows.orjson, None]:
+            with mock.patch.object(rows, 'orjson', encoder):
+                serializer = rows.RowSerializer(JOB_FIELDS)
+                data = serializer.serialize(JobPost.objects.all())
+                self.assertEqual(json.loads(rows.dumps(data)), json.loads(json.dumps(expected)))
+                # Keys, nested ones included, come out in the declared order
+                self.assertEqual(list(data[0]), list(expected[0]))
+                self.assertEqual(list(data[0]['company']), list(expected[0]['company']))
+
+    def test_columns_shared_or_out_of_order(self):
+        serializer = rows.RowSerializer({'company': {'name': 'company__name'}, 'id': 'id',
+                                         'owner': {'id': 'company_id', 'name': 'company__name'}})
+        job = self.jobs[0]
+        data = serializer.serialize(JobPost.objects.filter(pk=job.pk))
+        self.assertEqual(data, [{'company': {'name': 'Acme'}, 'id': job.id,
+                                 'owner': {'id': self.acme.id, 'name': 'Acme'}}])
+
+    def test_listing_reads_one_joined_values_query(self):
+        with self.assertNumQueries(4):  # validators (count + 2 MAX) + the page itself
+            response = self.client.get('/api/jobs/', {'company_id': self.acme.id})
+        self.assertEqual(response.json()['jobs'][0]['company']['name'], 'Acme')
+
+
+class DatabaseRoutingTests(TestCase):
+
+    def route(self, method, *, write=False):
+        """Aliases a read gets before and after an optional write inside a request"""
+        router = PrimaryReplicaRouter()
+        seen = []
+
+        def view(request):
+            seen.append(router.db_for_read(JobPost))
+            if write:
+                router.db_for_write(JobPost)
+            seen.append(router.db_for_read(JobPost))
+            return None
+
+        ReadReplicaMiddleware(view)(getattr(RequestFactory(), method)('/'))
+        return seen
+
+    def test_safe_requests_read_from_replica_until_they_write(self):
+        self.assertEqual(self.route('get'), ['replica', 'replica'])
+        self.assertEqual(self.route('get', write=True), ['replica', 'default'])
+
+    def test_unsafe_requests_and_code_outside_requests_use_primary(self):
+        self.assertEqual(self.route('post'), ['default', 'default'])
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(JobPost), 'default')
+        self.assertFalse(PrimaryReplicaRouter().allow_migrate('replica', 'jobs'))
+
+
+class AdminChangelistTests(JobPortalTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass12345'))
+
+    def add_applicants(self, count):
+        Applicant.objects.bulk_create(
+            Applicant(name=f'A{i}', email=f'a{i}@example.com', resume_link='https://example.com/cv',
+                      job=self.jobs[i % len(self.jobs)])
+            for i in range(Applicant.objects.count(), Applicant.objects.count() + count)
+        )
+
+    def changelist_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_row_str_does_not_query_per_row(self):
+        self.add_applicants(2)
+        _, few = self.changelist_queries('/admin/jobs/applicant/')
+        self.add_applicants(20)
+        response, many = self.changelist_queries('/admin/jobs/applicant/')
+        self.assertEqual(few, many)
+        self.assertContains(response, 'Engineer 1 at Globex')
+
+    def test_page_query_reads_only_displayed_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/admin/jobs/jobpost/')
+        page = [q['sql'] for q in queries if 'INNER JOIN "jobs_company"' in q['sql']]
+        self.assertEqual(len(page), 1)
+        self.assertIn('"jobs_company"."name"', page[0])
+        self.assertNotIn('description', page[0])
+
+    def test_id_range_filter_replaces_company_list(self):
+        response, _ = self.changelist_queries('/admin/jobs/jobpost/',
+                                              {'company_id__gte': self.acme.id,
+                                               'company_id__lte': self.acme.id})
+        self.assertEqual(response.context['cl'].result_count, 3)
+        self.assertContains(response, f'name="company_id__lte" value="{self.acme.id}"')
+        response = self.client.get('/admin/jobs/jobpost/', {'company_id__gte': 'x'})
+        self.assertRedirects(response, '/admin/jobs/jobpost/?e=1', fetch_redirect_response=False)
+
+    def test_count_is_bounded_past_the_limit(self):
+        with mock.patch.object(EstimatedCountPaginator, 'EXACT_COUNT_LIMIT', 3):
+            self.assertEqual(EstimatedCountPaginator(JobPost.objects.all(), 2).count,
+                             JobPost.objects.order_by('-id').first().id)
+            self.assertEqual(EstimatedCountPaginator(JobPost.objects.filter(salary__gt=0), 2).count, 3)
+            self.assertEqual(EstimatedCountPaginator(JobPost.objects.filter(salary__gt=3000), 2).count, 2)
+
+
+class CompanyDashboardTests(JobPortalTestCase):
+
+    def test_dashboard_aggregates_in_fixed_queries(self):
+        for i, job in enumerate(self.jobs):
+            for j in range(i):
+                Applicant.objects.create(name=f'A{j}', email=f'a{j}@example.com',
+                                         resume_link='https://example.com/cv', job=job)
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/companies/{self.acme.id}/dashboard/')
+        data = response.json()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        # Acme has jobs 0, 2 and 4 with 0, 2 and 4 applicants
+        self.assertEqual([job['applicants'] for job in data['jobs']], [4, 2, 0])
+        self.assertEqual(data['total_applicants'], 6)
+        self.assertEqual(data['salary'], {'min': 1000, 'max': 5000, 'avg': 3000.0})
+        self.assertEqual(sum(day['applications'] for day in data['applications_per_day']), 6)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/api/companies/{self.acme.id}/dashboard/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_dashboard_errors(self):
+        self.assertEqual(self.client.get('/api/companies/999999/dashboard/').status_code, 404)
+        response = self.client.get(f'/api/companies/{self.acme.id}/dashboard/', {'days': 'x'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f'/api/companies/{self.acme.id}/dashboard/', {'days': 0})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(JOBS_CHANGES_SETTLE_SECONDS=0)
+class JobChangesFeedTests(JobPortalTestCase):
+
+    def poll(self, token=None, **params):
+        if token:
+            params['since'] = token
+        response = self.client.get('/api/jobs/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_full_sync_then_only_deltas(self):
+        first = self.poll(limit=3)
+        self.assertTrue(first['has_more'])
+        second = self.poll(first['next_token'], limit=3)
+        self.assertFalse(second['has_more'])
+        synced = [job['id'] for job in first['updated'] + second['updated']]
+        self.assertEqual(sorted(synced), sorted(job.id for job in self.jobs))
+
+        self.assertEqual(self.poll(second['next_token'])['updated'], [])
+
+        edited, gone_id = self.jobs[1], self.jobs[2].id
+        edited.salary = 9999
+        edited.save()
+        self.jobs[2].delete()
+        with self.assertNumQueries(2):
+            delta = self.poll(second['next_token'])
+        self.assertEqual([(job['id'], job['salary']) for job in delta['updated']], [(edited.id, 9999)])
+        self.assertEqual(delta['deleted'], [gone_id])
+        later = self.poll(delta['next_token'])
+        self.assertEqual((later['updated'], later['deleted']), ([], []))
+
+    def test_company_rename_and_bad_tokens(self):
+        token = self.poll()['next_token']
+        self.acme.name = 'Acme Corp'
+        self.acme.save()
+        delta = self.poll(token)
+        self.assertEqual({job['company']['name'] for job in delta['updated']}, {'Acme Corp'})
+        self.assertEqual(len(delta['updated']), 3)
+
+        self.assertEqual(self.client.get('/api/jobs/changes/', {'since': 'junk'}).status_code, 400)
+        naive = encode_token({'j': None, 't': None, 'at': '2024-01-01T00:00:00'})
+        self.assertEqual(self.client.get('/api/jobs/changes/', {'since': naive}).status_code, 400)
+        naive = encode_token({'j': ['2024-01-01T00:00:00', 1], 't': None,
+                              'at': timezone.now().isoformat()})
+        self.assertEqual(self.client.get('/api/jobs/changes/', {'since': naive}).status_code, 400)
+        with override_settings(JOBS_TOMBSTONE_RETENTION_DAYS=0):
+            self.assertEqual(self.client.get('/api/jobs/changes/', {'since': token}).status_code, 410)
+
+    def test_company_edit_without_rename_leaves_jobs_alone(self):
+        token = self.poll()['next_token']
+        self.acme.location = 'Mumbai'
+        with CaptureQueriesContext(connection) as queries:
+            self.acme.save()
+        self.assertFalse(any('jobs_jobpost' in query['sql'] for query in queries))
+        self.assertEqual(self.poll(token)['updated'], [])
+
+    def test_prune_tombstones(self):
+        self.jobs[0].delete()
+        call_command('prune_job_tombstones', days=0, stdout=StringIO())
+        self.assertFalse(JobPostTombstone.objects.exists())
+
+
+class LocationTests(JobPortalTestCase):
+
+    def test_spelling_variants_share_one_location(self):
+        self.assertEqual(location_key(' New-Delhi. '), 'new delhi')
+        self.assertEqual(location_key('Bengalūru'), 'bengaluru')
+        job = JobPost.objects.create(company=self.acme, title='Ops', description='Run things',
+                                     salary=500, location='  PUNE ')
+        self.assertEqual(job.location_ref, self.jobs[0].location_ref)
+        self.assertEqual(Location.objects.filter(key='pune').count(), 1)
+
+    def test_location_is_resolved_only_when_it_changes(self):
+        job = JobPost.objects.get(pk=self.jobs[0].pk)
+        job.salary = 1234
+        with CaptureQueriesContext(connection) as queries:
+            job.save()
+        self.assertFalse(any('FROM "jobs_location"' in query['sql'] for query in queries))
+
+        job.location = 'Mumbai'
+        job.save()
+        self.assertEqual(job.location_ref.key, 'mumbai')
+        self.acme.location = 'mumbai '
+        self.acme.save()
+        self.assertEqual(self.acme.location_ref, job.location_ref)
+
+    def test_location_filter_is_an_equality_lookup(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/', {'location': 'delhi '})
+        self.assertEqual({job['id'] for job in response.json()['jobs']},
+                         {self.jobs[1].id, self.jobs[3].id})
+        self.assertIn('"jobs_location"."key" = ', queries[-1]['sql'])
+        self.assertNotIn('LIKE', queries[-1]['sql'])
+
+    def test_backfill_links_old_rows(self):
+        JobPost.objects.update(location_ref=None)
+        Company.objects.update(location_ref=None)
+        out = StringIO()
+        call_command('backfill_locations', chunk_size=2, stdout=out)
+        self.assertIn('5 row(s) linked', out.getvalue())
+        self.assertFalse(JobPost.objects.filter(location_ref__isnull=True).exists())
+        self.assertEqual(JobPost.objects.filter(location_ref__key='pune').count(), 3)
+
+
+class FacetTests(JobPortalTestCase):
+
+    def test_facets_count_the_filtered_set(self):
+        with self.assertNumQueries(7):  # validators (count + 2 MAX), page, one GROUP BY per facet
+            response = self.client.get('/api/jobs/', {'facets': 'location,company,salary_band',
+                                                      'salary_min': 2000, 'limit': 1})
+        data = response.json()
+        self.assertEqual(len(data['jobs']), 1)
+        self.assertEqual([(b['name'], b['count']) for b in data['facets']['location']],
+                         [('Delhi', 2), ('Pune', 2)])  # ties by name
+        self.assertEqual({b['name']: b['count'] for b in data['facets']['company']},
+                         {'Acme': 2, 'Globex': 2})
+        self.assertEqual(data['facets']['salary_band'][0], {'band': '0-25k', 'count': 4})
+        self.assertEqual(self.client.get('/api/jobs/', {'facets': 'colour'}).status_code, 400)
+
+    @override_settings(JOBS_MATERIALIZED_FACETS=True)
+    def test_materialized_facets_follow_job_writes(self):
+        call_command('rebuild_job_facets', stdout=StringIO())
+        self.client.post('/api/post-job/', {
+            'company_id': self.globex.id, 'title': 'Lead', 'description': 'd',
+            'salary': 120000, 'location': 'Mumbai',
+        }, content_type='application/json')
+        self.client.post('/api/post-jobs/bulk/', [{
+            'company_id': self.acme.id, 'title': 'Bulk', 'description': 'd',
+            'salary': 30000, 'location': 'pune',
+        }], content_type='application/json')
+        moved = self.jobs[1]
+        moved.salary = 60000
+        moved.location = 'Mumbai'
+        moved.save()
+        self.jobs[0].delete()
+        self.acme.name = 'Acme Corp'
+        self.acme.save()
+
+        expected = facets.compute_facets(JobPost.objects.all(), facets.FACETS)
+        # validators (count + 2 MAX), page, no-expired-jobs EXISTS, one FacetCount read
+        with self.assertNumQueries(6):
+            response = self.client.get('/api/jobs/', {'facets': ','.join(facets.FACETS)})
+        self.assertEqual(response.json()['facets'], expected)
+        self.assertEqual({b['name'] for b in expected['company']}, {'Acme Corp', 'Globex'})
+
+
+class ApplicationsByEmailTests(JobPortalTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for job, email in [(cls.jobs[0], 'Sam@Example.com'), (cls.jobs[1], 'sam@example.com'),
+                           (cls.jobs[2], 'kim@example.com')]:
+            Applicant.objects.create(name='Candidate', email=email,
+                                     resume_link='https://example.com/cv', job=job)
+
+    def test_lookup_is_one_indexed_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/applications/', {'email': ' SAM@example.com'})
+        self.assertEqual(len(queries), 1)
+        data = response.json()
+        self.assertEqual(data['total'], 2)
+        self.assertEqual({a['job']['company']['name'] for a in data['applications']}, {'Acme', 'Globex'})
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + queries[0]['sql'].replace('%s', "'x'"))
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('applicant_email_lower_idx', plan)
+        self.assertEqual(self.client.get('/api/applications/').status_code, 400)
+
+    def test_bulk_lookup(self):
+        response = self.client.post('/api/applications/lookup/', {
+            'emails': ['sam@example.com', 'KIM@example.com', 'nobody@example.com'],
+        }, content_type='application/json')
+        data = response.json()
+        self.assertEqual({email: len(found) for email, found in data['applications'].items()},
+                         {'sam@example.com': 2, 'kim@example.com': 1, 'nobody@example.com': 0})
+        self.assertEqual(data['total_applications'], 3)
+        response = self.client.post('/api/applications/lookup/', {'emails': 'x'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class JobLifecycleTests(JobPortalTestCase):
+
+    def apply(self, job, email='late@example.com'):
+        return self.client.post('/api/apply/', {
+            'name': 'Late', 'email': email, 'resume_link': 'https://example.com/cv', 'job_id': job.id,
+        }, content_type='application/json')
+
+    def test_closed_jobs_leave_listings_and_stop_applications(self):
+        closed, expired = self.jobs[0], self.jobs[1]
+        closed.is_active = False
+        closed.save()
+        expired.closes_at = timezone.now() - timezone.timedelta(minutes=1)
+        expired.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            listed = {job['id'] for job in self.client.get('/api/jobs/').json()['jobs']}
+        self.assertNotIn(closed.id, listed)
+        self.assertNotIn(expired.id, listed)
+        self.assertIn(self.jobs[2].id, listed)
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + queries[-1]['sql'].replace('%s', '1'))
+            self.assertIn('jobpost_active_created_idx', str(cursor.fetchall()))
+
+        searched = {hit['id'] for hit in self.client.get('/api/jobs/search/', {'q': 'engineer'}).json()['jobs']}
+        self.assertEqual(searched, set(listed))
+        company_counts = {b['name']: b['count'] for b in
+                          self.client.get('/api/jobs/', {'facets': 'company'}).json()['facets']['company']}
+        self.assertEqual(company_counts, {'Acme': 2, 'Globex': 1})
+        with self.settings(JOBS_MATERIALIZED_FACETS=True):
+            call_command('rebuild_job_facets', stdout=StringIO())
+            cache.bump_generation()
+            # FacetCount still counts the expired job, so the listing recounts live
+            self.assertFalse(facets.materialized_current())
+            company_counts = {b['name']: b['count'] for b in
+                              self.client.get('/api/jobs/', {'facets': 'company'}).json()['facets']['company']}
+            self.assertEqual(company_counts, {'Acme': 2, 'Globex': 1})
+        self.assertEqual(self.apply(closed).status_code, 400)
+        self.assertEqual(self.apply(expired).status_code, 400)
+        self.assertEqual(self.apply(self.jobs[2]).status_code, 201)
+
+    @override_settings(JOBS_MATERIALIZED_FACETS=True)
+    def test_archive_moves_jobs_and_applicants(self):
+        call_command('rebuild_job_facets', stdout=StringIO())
+        job = self.jobs[0]
+        for i in range(3):
+            self.apply(job, f'a{i}@example.com')
+        job.refresh_from_db()
+        job.closes_at = timezone.now() - timezone.timedelta(days=1)
+        job.save()
+
+        out = StringIO()
+        with mock.patch.object(archive, 'APPLICANT_CHUNK_SIZE', 2), \
+                CaptureQueriesContext(connection) as queries:
+            call_command('archive_expired_jobs', batch_size=1, stdout=out)
+        self.assertIn('Archived 1 job(s) and 3 applicant(s)', out.getvalue())
+        # Applicants leave in their own small transactions, ahead of the job
+        deletes = [q['sql'] for q in queries if q['sql'].startswith('DELETE FROM "jobs_')]
+        self.assertEqual([sql.split('"')[1] for sql in deletes],
+                         ['jobs_applicant', 'jobs_applicant', 'jobs_jobpost'])
+        self.assertFalse(JobPost.objects.filter(id=job.id).exists())
+        self.assertFalse(Applicant.objects.filter(job_id=job.id).exists())
+        self.assertTrue(JobPostTombstone.objects.filter(job_id=job.id).exists())
+        self.assertEqual(facets.materialized_facets(facets.FACETS),
+                         facets.compute_facets(JobPost.objects.all(), facets.FACETS))
+
+        data = self.client.get(f'/api/archive/jobs/{job.id}/').json()
+        self.assertEqual(data['job']['company'], {'id': self.acme.id, 'name': 'Acme'})
+        self.assertEqual(data['total_applicants'], 3)
+        listing = self.client.get('/api/archive/jobs/', {'company_id': self.acme.id}).json()
+        self.assertEqual([j['id'] for j in listing['jobs']], [job.id])
+        self.assertEqual(self.client.get('/api/archive/jobs/999999/').status_code, 404)
+        self.assertEqual(ArchivedJobPost.objects.get(id=job.id).applicant_count, 3)
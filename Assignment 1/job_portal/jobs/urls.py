@@ -7,7 +7,17 @@ app_name = 'jobs'
 urlpatterns = [
     path('create-company/', views.create_company, name='create_company'),
     path('post-job/', views.post_job, name='post_job'),
+    path('post-jobs/bulk/', views.post_jobs_bulk, name='post_jobs_bulk'),
     path('jobs/', views.get_jobs, name='get_jobs'),
+    path('jobs/changes/', views.job_changes, name='job_changes'),
+    path('jobs/search/', views.search_jobs, name='search_jobs'),
+    path('jobs/<int:job_id>/stats/', views.job_stats, name='job_stats'),
+    path('companies/<int:company_id>/dashboard/', views.company_dashboard, name='company_dashboard'),
     path('apply/', views.apply_job, name='apply_job'),
+    path('apply/status/<uuid:ticket>/', views.application_status, name='application_status'),
     path('applicants/<int:job_id>/', views.get_applicants, name='get_applicants'),
+    path('applications/', views.get_applications, name='get_applications'),
+    path('applications/lookup/', views.lookup_applications, name='lookup_applications'),
+    path('archive/jobs/', views.get_archived_jobs, name='get_archived_jobs'),
+    path('archive/jobs/<int:job_id>/', views.get_archived_job, name='get_archived_job'),
 ]
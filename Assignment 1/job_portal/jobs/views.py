@@ -1,12 +1,118 @@
 # jobs/views.py
 import json
+from operator import itemgetter
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
-from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition, require_http_methods
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
-from .models import Company, JobPost, Applicant
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import Lower, TruncDate
+from django.utils import timezone
+from datetime import timedelta
+from django_common.pagination import InvalidCursor, keyset_page, parse_limit
+from django_common.rows import RowJsonResponse, RowSerializer
+from . import changes, counters, facets, ingest
+from .archive import parse_closes_at
+from .bulk import BulkPayloadError, bulk_create_jobs, parse_bulk_body
+from .cache import cache_response
+from .conditional import (
+    applicants_etag, jobs_etag, jobs_last_modified,
+)
+from .filters import filter_jobs, include_fields, is_filtered, wants_live_counts
+from .models import (
+    Company, JobPost, JobPostTombstone, Applicant, ApplicationTicket, ArchivedApplicant, ArchivedJobPost,
+)
+from .search import search_jobs as run_job_search
+from .streaming import stream_format, streaming_response
+
+def serialize_job(job, include=()):
+    """Listing representation of a job (company must be select_related)"""
+    data = {
+        'id': job.id,
+        'title': job.title,
+        'description': job.description,
+        'salary': job.salary,
+        'location': job.location,
+        'company': {
+            'id': job.company.id,
+            'name': job.company.name,
+            'location': job.company.location
+        },
+        'created_at': job.created_at.isoformat()
+    }
+    if 'applicant_count' in include:
+        data['applicant_count'] = job.applicant_count
+    return data
+
+# Listing shapes (JOB_FIELDS matches serialize_job), read with values_list()
+# so list endpoints skip model instantiation (see django_common/rows.py)
+JOB_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'salary': 'salary',
+    'location': 'location',
+    'company': {
+        'id': 'company_id',
+        'name': 'company__name',
+        'location': 'company__location'
+    },
+    'created_at': 'created_at'
+}
+JOB_ROWS = RowSerializer(JOB_FIELDS)
+JOB_ROWS_WITH_COUNT = RowSerializer(dict(JOB_FIELDS, applicant_count='applicant_count'))
+CHANGED_JOB_ROWS = RowSerializer(dict(JOB_FIELDS, updated_at='updated_at', closes_at='closes_at',
+                                      is_active='is_active'))
+
+APPLICANT_ROWS = RowSerializer({
+    'id': 'id',
+    'name': 'name',
+    'email': 'email',
+    'resume_link': 'resume_link',
+    'applied_at': 'applied_at'
+})
+
+APPLICATION_ROWS = RowSerializer({
+    'id': 'id',
+    'name': 'name',
+    'email': 'email',
+    'resume_link': 'resume_link',
+    'applied_at': 'applied_at',
+    'job': {
+        'id': 'job_id',
+        'title': 'job__title',
+        'company': {'id': 'job__company_id', 'name': 'job__company__name'}
+    }
+})
+
+ARCHIVED_JOB_ROWS = RowSerializer({
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'salary': 'salary',
+    'location': 'location',
+    'company': {'id': 'company_id', 'name': 'company_name'},
+    'created_at': 'created_at',
+    'closes_at': 'closes_at',
+    'archived_at': 'archived_at',
+    'applicant_count': 'applicant_count'
+})
+ARCHIVED_APPLICANT_ROWS = RowSerializer({
+    'id': 'id',
+    'name': 'name',
+    'email': 'email',
+    'resume_link': 'resume_link',
+    'applied_at': 'applied_at'
+})
+
+def job_rows(include=()):
+    return JOB_ROWS_WITH_COUNT if 'applicant_count' in include else JOB_ROWS
+
+def row_cursor_key(rows):
+    """(created_at, id) of a values_list() row, for keyset pagination"""
+    return itemgetter(rows.index('created_at'), rows.index('id'))
 
 @csrf_exempt
 @require_http_methods(["POST"])
@@ -82,13 +188,20 @@ def post_job(request):
                 'error': 'Salary must be positive'
             }, status=400)
         
+        # Optional end of the application window
+        try:
+            closes_at = parse_closes_at(data.get('closes_at'))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
         # Create job post
         job = JobPost.objects.create(
             company=company,
             title=data['title'].strip(),
             description=data['description'].strip(),
             salary=data['salary'],
-            location=data['location'].strip()
+            location=data['location'].strip(),
+            closes_at=closes_at
         )
         
         # Return success response
@@ -101,7 +214,8 @@ def post_job(request):
                 'description': job.description,
                 'salary': job.salary,
                 'location': job.location,
-                'created_at': job.created_at.isoformat()
+                'created_at': job.created_at.isoformat(),
+                'closes_at': job.closes_at.isoformat() if job.closes_at else None
             }
         }, status=201)
         
@@ -114,31 +228,269 @@ def post_job(request):
             'error': 'Internal server error'
         }, status=500)
 
+@csrf_exempt
+@require_http_methods(["POST"])
+def post_jobs_bulk(request):
+    """
+    Post many jobs in one request
+    POST /api/post-jobs/bulk/
+    Body: a JSON array of post_job bodies, {"jobs": [...]}, or NDJSON
+    (Content-Type: application/x-ndjson). Invalid items are reported by
+    index and do not stop the valid ones from being created.
+    """
+    try:
+        try:
+            items = parse_bulk_body(request)
+        except (BulkPayloadError, UnicodeDecodeError) as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        created, errors = bulk_create_jobs(items)
+        
+        if not created:
+            status = 400
+        elif errors:
+            status = 207
+        else:
+            status = 201
+        
+        return JsonResponse({
+            'message': f'{len(created)} of {len(items)} jobs posted',
+            'created': [{'index': index, 'id': job.id} for index, job in created],
+            'errors': errors,
+            'total_created': len(created)
+        }, status=status)
+        
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
 @require_http_methods(["GET"])
+@condition(etag_func=jobs_etag, last_modified_func=jobs_last_modified)
+@cache_response('jobs', skip=wants_live_counts)
 def get_jobs(request):
-    """Get all job posts"""
+    """
+    Get job posts, newest first, one page at a time
+    GET /api/jobs/?limit=20&cursor=<next_cursor>&location=&company_id=&salary_min=&salary_max=
+    Add ?stream=1 (JSON) or ?stream=ndjson to stream every matching job instead,
+    and ?include=applicant_count for the denormalized applicant counter.
+    ?facets=location,company,salary_band adds bucket counts for the whole
+    filtered set (not just the page); streamed responses carry no facets.
+    """
     try:
-        jobs = JobPost.objects.select_related('company').all()
+        facet_names = facets.parse_facets(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    try:
+        rows = job_rows(include_fields(request.GET))
+        build = rows.builder(JobPost)
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+            filtered = filter_jobs(JobPost.objects.all(), request.GET)
+            fmt = stream_format(request)
+            if fmt:
+                return streaming_response(fmt, rows.values(filtered.order_by('-created_at', 'id')),
+                                          build, 'jobs')
+            jobs, next_cursor = keyset_page(rows.values(filtered), request.GET.get('cursor'), limit,
+                                            key=row_cursor_key(rows))
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except ValueError:
+            return JsonResponse({
+                'error': 'company_id, salary_min and salary_max must be integers'
+            }, status=400)
         
-        jobs_data = []
-        for job in jobs:
-            jobs_data.append({
-                'id': job.id,
-                'title': job.title,
-                'description': job.description,
-                'salary': job.salary,
-                'location': job.location,
-                'company': {
-                    'id': job.company.id,
-                    'name': job.company.name,
-                    'location': job.company.location
-                },
-                'created_at': job.created_at.isoformat()
-            })
+        jobs_data = [build(row) for row in jobs]
+        data = {
+            'jobs': jobs_data,
+            'total': len(jobs_data),
+            'next_cursor': next_cursor
+        }
+        if facet_names:
+            if (facets.materialized_enabled() and not is_filtered(request.GET)
+                    and facets.materialized_current()):
+                data['facets'] = facets.materialized_facets(facet_names)
+            else:
+                data['facets'] = facets.compute_facets(filtered, facet_names)
+        
+        return RowJsonResponse(data, status=200)
         
+    except Exception as e:
         return JsonResponse({
-            'jobs': jobs_data,
-            'total': len(jobs_data)
+            'error': 'Internal server error'
+        }, status=500)
+
+CHANGES_DEFAULT_LIMIT = 100
+CHANGES_MAX_LIMIT = 1000
+
+@require_http_methods(["GET"])
+def job_changes(request):
+    """
+    Jobs created, updated or deleted since a sync token
+    GET /api/jobs/changes/?since=<token>&limit=100
+    Without since, walks the whole catalog. Keep calling with next_token
+    while has_more is true, then poll with the last next_token.
+    """
+    try:
+        limit = parse_limit(request.GET.get('limit'), CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT)
+        sync = changes.parse_sync_token(request.GET.get('since'))
+        expired = changes.token_expired(sync)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    if expired:
+        return JsonResponse({
+            'error': 'Sync token expired, start again without since'
+        }, status=410)
+    
+    try:
+        until = changes.settled_before()
+        updated = list(changes.rows_after(
+            CHANGED_JOB_ROWS.values(JobPost.objects.all()), 'updated_at', sync.jobs, until
+        )[:limit + 1])
+        deleted = list(changes.rows_after(
+            JobPostTombstone.objects.values_list('deleted_at', 'id', 'job_id'),
+            'deleted_at', sync.tombstones, until
+        )[:limit + 1])
+        has_more = len(updated) > limit or len(deleted) > limit
+        updated, deleted = updated[:limit], deleted[:limit]
+        
+        jobs_position = sync.jobs
+        if updated:
+            last = updated[-1]
+            jobs_position = (last[CHANGED_JOB_ROWS.index('updated_at')], last[CHANGED_JOB_ROWS.index('id')])
+        tombstones_position = sync.tombstones
+        if deleted:
+            tombstones_position = deleted[-1][:2]
+        
+        build = CHANGED_JOB_ROWS.builder(JobPost)
+        return RowJsonResponse({
+            'updated': [build(row) for row in updated],
+            'deleted': [job_id for _, _, job_id in deleted],
+            'next_token': changes.make_sync_token(jobs_position, tombstones_position),
+            'has_more': has_more
+        }, status=200)
+    
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
+@require_http_methods(["GET"])
+def job_stats(request, job_id):
+    """
+    Lightweight per-job stats, read from JobPost only
+    GET /api/jobs/<id>/stats/
+    """
+    job = (
+        JobPost.objects.filter(id=job_id)
+        .values('id', 'title', 'company__name', 'applicant_count', 'created_at')
+        .first()
+    )
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    
+    return JsonResponse({
+        'job': {
+            'id': job['id'],
+            'title': job['title'],
+            'company': job['company__name']
+        },
+        'applicant_count': job['applicant_count'],
+        'created_at': job['created_at'].isoformat()
+    })
+
+DASHBOARD_DEFAULT_DAYS = 30
+DASHBOARD_MAX_DAYS = 365
+
+@require_http_methods(["GET"])
+@cache_response('dashboard', timeout=getattr(settings, 'JOBS_DASHBOARD_CACHE_TIMEOUT', 15))
+def company_dashboard(request, company_id):
+    """
+    Applicant totals per job, applications per day and salary statistics
+    for one company, from four queries whatever the company size
+    GET /api/companies/<id>/dashboard/?days=30
+    """
+    try:
+        days = int(request.GET.get('days', DASHBOARD_DEFAULT_DAYS))
+    except ValueError:
+        return JsonResponse({'error': 'days must be an integer'}, status=400)
+    if not 1 <= days <= DASHBOARD_MAX_DAYS:
+        return JsonResponse({'error': f'days must be between 1 and {DASHBOARD_MAX_DAYS}'}, status=400)
+    
+    try:
+        company = Company.objects.filter(id=company_id).values('id', 'name', 'location').first()
+        if company is None:
+            return JsonResponse({'error': 'Company not found'}, status=404)
+        
+        # One GROUP BY over the company's jobs joined to their applicants
+        jobs = list(
+            JobPost.objects.filter(company_id=company_id)
+            .values('id', 'title', 'salary')
+            .annotate(applicants=Count('applicants'))
+            .order_by('-applicants', 'id')
+        )
+        
+        salary = JobPost.objects.filter(company_id=company_id).aggregate(
+            min=Min('salary'), max=Max('salary'), avg=Avg('salary')
+        )
+        if salary['avg'] is not None:
+            salary['avg'] = round(salary['avg'], 2)
+        
+        since = timezone.now() - timedelta(days=days)
+        per_day = (
+            Applicant.objects.filter(job__company_id=company_id, applied_at__gte=since)
+            .annotate(day=TruncDate('applied_at'))
+            .values('day')
+            .annotate(applications=Count('id'))
+            .order_by('day')
+        )
+        
+        return JsonResponse({
+            'company': company,
+            'total_jobs': len(jobs),
+            'total_applicants': sum(job['applicants'] for job in jobs),
+            'jobs': jobs,
+            'salary': salary,
+            'days': days,
+            'applications_per_day': [
+                {'date': row['day'].isoformat(), 'applications': row['applications']}
+                for row in per_day
+            ]
+        })
+    
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
+@require_http_methods(["GET"])
+@cache_response('search')
+def search_jobs(request):
+    """
+    Full-text search over job title, description and company name
+    GET /api/jobs/search/?q=python+developer&limit=20
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'error': 'q is required'}, status=400)
+    
+    try:
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        results = []
+        for job, score in run_job_search(query, limit):
+            job_data = serialize_job(job)
+            job_data['score'] = score
+            results.append(job_data)
+        
+        return JsonResponse({
+            'query': query,
+            'jobs': results,
+            'total': len(results)
         }, status=200)
         
     except Exception as e:
@@ -149,7 +501,11 @@ def get_jobs(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def apply_job(request):
-    """Apply for a job"""
+    """
+    Apply for a job
+    With settings.JOBS_QUEUE_APPLICATIONS the application is queued and
+    202 is returned with a ticket to poll at /api/apply/status/<ticket>/.
+    """
     try:
         # Parse JSON data
         data = json.loads(request.body)
@@ -162,22 +518,48 @@ def apply_job(request):
                     'error': f'{field} is required'
                 }, status=400)
         
+        # Write-behind mode: store the submission, the worker does the rest
+        if ingest.queue_enabled():
+            try:
+                job_id = int(data['job_id'])
+            except (TypeError, ValueError):
+                return JsonResponse({'error': 'job_id must be an integer'}, status=400)
+            ticket = ingest.enqueue_application(
+                name=data['name'].strip(),
+                email=data['email'].strip(),
+                resume_link=data['resume_link'].strip(),
+                job_id=job_id
+            )
+            return JsonResponse({
+                'message': 'Application queued',
+                'ticket': str(ticket.ticket),
+                'status': ticket.status,
+                'status_url': f'/api/apply/status/{ticket.ticket}/'
+            }, status=202)
+        
         # Validate job exists
         try:
-            job = JobPost.objects.get(id=data['job_id'])
+            job = JobPost.objects.select_related('company').get(id=data['job_id'])
         except JobPost.DoesNotExist:
             return JsonResponse({
                 'error': 'Job not found'
             }, status=404)
         
-        # Create applicant
+        if not job.accepts_applications():
+            return JsonResponse({
+                'error': 'This job is no longer accepting applications'
+            }, status=400)
+        
+        # Create applicant and bump the job's counter in one transaction
         try:
-            applicant = Applicant.objects.create(
-                name=data['name'].strip(),
-                email=data['email'].strip(),
-                resume_link=data['resume_link'].strip(),
-                job=job
-            )
+            with transaction.atomic():
+                applicant = Applicant.objects.create(
+                    name=data['name'].strip(),
+                    email=data['email'].strip(),
+                    resume_link=data['resume_link'].strip(),
+                    job=job
+                )
+                counters.add_applicants(job.id)
         except IntegrityError:
             return JsonResponse({
                 'error': 'You have already applied for this job'
@@ -210,26 +592,53 @@ def apply_job(request):
         }, status=500)
 
 @require_http_methods(["GET"])
+def application_status(request, ticket):
+    """
+    Status of a queued application
+    GET /api/apply/status/<ticket>/
+    """
+    try:
+        ticket = ApplicationTicket.objects.get(ticket=ticket)
+    except ApplicationTicket.DoesNotExist:
+        return JsonResponse({'error': 'Ticket not found'}, status=404)
+    
+    return JsonResponse({
+        'ticket': str(ticket.ticket),
+        'status': ticket.status,
+        'application_id': ticket.applicant_id,
+        'job_id': ticket.job_id,
+        'error': ticket.error or None,
+        'created_at': ticket.created_at.isoformat(),
+        'processed_at': ticket.processed_at.isoformat() if ticket.processed_at else None
+    })
+
+@require_http_methods(["GET"])
+@condition(etag_func=applicants_etag)
 def get_applicants(request, job_id):
-    """Get all applicants for a specific job"""
+    """
+    Get all applicants for a specific job
+    GET /api/applicants/<job_id>/ (add ?stream=1 or ?stream=ndjson to stream rows)
+    """
     try:
         # Validate job exists
-        job = get_object_or_404(JobPost, id=job_id)
+        try:
+            job = JobPost.objects.select_related('company').get(id=job_id)
+        except JobPost.DoesNotExist:
+            return JsonResponse({'error': 'Job not found'}, status=404)
         
         # Get all applicants for this job
-        applicants = Applicant.objects.filter(job=job).select_related('job__company')
+        applicants = APPLICANT_ROWS.values(Applicant.objects.filter(job=job))
+        build = APPLICANT_ROWS.builder(Applicant)
         
-        applicants_data = []
-        for applicant in applicants:
-            applicants_data.append({
-                'id': applicant.id,
-                'name': applicant.name,
-                'email': applicant.email,
-                'resume_link': applicant.resume_link,
-                'applied_at': applicant.applied_at.isoformat()
-            })
+        fmt = stream_format(request)
+        if fmt:
+            header = {'job': {'id': job.id, 'title': job.title, 'company': job.company.name}}
+            return streaming_response(fmt, applicants, build, 'applicants',
+                                      total_key='total_applicants', header=header)
         
-        return JsonResponse({
+        applicants_data = [build(row) for row in applicants]
+        
+        return RowJsonResponse({
             'job': {
                 'id': job.id,
                 'title': job.title,
@@ -244,19 +653,170 @@ def get_applicants(request, job_id):
             'error': 'Internal server error'
         }, status=500)
 
+EMAIL_LOOKUP_CHUNK_SIZE = 500
+MAX_LOOKUP_EMAILS = 1000
 
+def applications_by_email(emails):
+    """
+    Applications (newest first) of lower-cased emails, one joined query
+    per chunk served by applicant_email_lower_idx
+    """
+    emails = sorted(set(emails))
+    found = {email: [] for email in emails}
+    build = APPLICATION_ROWS.builder(Applicant)
+    email_index = APPLICATION_ROWS.index('email')
+    for start in range(0, len(emails), EMAIL_LOOKUP_CHUNK_SIZE):
+        chunk = emails[start:start + EMAIL_LOOKUP_CHUNK_SIZE]
+        rows = APPLICATION_ROWS.values(
+            Applicant.objects.alias(email_lower=Lower('email')).filter(email_lower__in=chunk)
+        ).order_by('-applied_at', 'id')
+        for row in rows:
+            found[row[email_index].lower()].append(build(row))
+    return found
 
-def api_welcome(request):
-    """Welcome page for the API"""
-    return JsonResponse({
+@require_http_methods(["GET"])
+def get_applications(request):
+    """
+    Every application made with an email address (case-insensitive)
+    GET /api/applications/?email=someone@example.com
+    """
+    email = request.GET.get('email', '').strip().lower()
+    if not email:
+        return JsonResponse({'error': 'email is required'}, status=400)
+    
+    try:
+        applications = applications_by_email([email])[email]
+        return RowJsonResponse({
+            'email': email,
+            'applications': applications,
+            'total': len(applications)
+        }, status=200)
+    
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def lookup_applications(request):
+    """
+    Bulk variant of get_applications for CRM syncs
+    POST /api/applications/lookup/  {"emails": ["a@example.com", ...]}
+    Returns {"applications": {email: [...]}} with every email present,
+    lower-cased, mapped to a possibly empty list.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+    
+    emails = data.get('emails') if isinstance(data, dict) else None
+    if not isinstance(emails, list) or not all(isinstance(email, str) for email in emails):
+        return JsonResponse({'error': 'emails must be a list of strings'}, status=400)
+    if len(emails) > MAX_LOOKUP_EMAILS:
+        return JsonResponse({
+            'error': f'At most {MAX_LOOKUP_EMAILS} emails per request'
+        }, status=400)
+    
+    try:
+        applications = applications_by_email(
+            email.strip().lower() for email in emails if email.strip()
+        )
+        return RowJsonResponse({
+            'applications': applications,
+            'total_emails': len(applications),
+            'total_applications': sum(len(found) for found in applications.values())
+        }, status=200)
+    
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
+@require_http_methods(["GET"])
+@cache_response('archive')
+def get_archived_jobs(request):
+    """
+    Read-only listing of archived jobs, newest first
+    GET /api/archive/jobs/?limit=20&cursor=<next_cursor>&company_id=
+    """
+    try:
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+            jobs = ArchivedJobPost.objects.all()
+            if request.GET.get('company_id'):
+                jobs = jobs.filter(company_id=int(request.GET['company_id']))
+            jobs, next_cursor = keyset_page(ARCHIVED_JOB_ROWS.values(jobs), request.GET.get('cursor'),
+                                            limit, key=row_cursor_key(ARCHIVED_JOB_ROWS))
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except ValueError:
+            return JsonResponse({'error': 'company_id must be an integer'}, status=400)
+        
+        build = ARCHIVED_JOB_ROWS.builder(ArchivedJobPost)
+        jobs_data = [build(row) for row in jobs]
+        return RowJsonResponse({
+            'jobs': jobs_data,
+            'total': len(jobs_data),
+            'next_cursor': next_cursor
+        }, status=200)
+    
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
+@require_http_methods(["GET"])
+@cache_response('archive')
+def get_archived_job(request, job_id):
+    """
+    One archived job with its applicants
+    GET /api/archive/jobs/<id>/
+    """
+    try:
+        job = ARCHIVED_JOB_ROWS.serialize(ArchivedJobPost.objects.filter(id=job_id))
+        if not job:
+            return JsonResponse({'error': 'Archived job not found'}, status=404)
+        
+        applicants = ARCHIVED_APPLICANT_ROWS.serialize(ArchivedApplicant.objects.filter(job_id=job_id))
+        return RowJsonResponse({
+            'job': job[0],
+            'applicants': applicants,
+            'total_applicants': len(applicants)
+        }, status=200)
+    
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Internal server error'
+        }, status=500)
+
+
+def welcome_data():
+    """Payload of the API welcome page, shared with the async view"""
+    return {
         'message': 'Welcome to Job Portal API',
         'version': '1.0',
         'endpoints': {
             'create_company': '/api/create-company/ (POST)',
             'post_job': '/api/post-job/ (POST)',
-            'get_jobs': '/api/jobs/ (GET)',
+            'post_jobs_bulk': '/api/post-jobs/bulk/ (POST, JSON array or NDJSON)',
+            'get_jobs': '/api/jobs/?cursor=&limit=&location=&company_id=&salary_min=&salary_max=&facets= (GET)',
+            'search_jobs': '/api/jobs/search/?q= (GET)',
+            'job_changes': '/api/jobs/changes/?since=<token> (GET)',
+            'job_stats': '/api/jobs/<id>/stats/ (GET)',
+            'company_dashboard': '/api/companies/<id>/dashboard/ (GET)',
             'apply_job': '/api/apply/ (POST)',
-            'get_applicants': '/api/applicants/<job_id>/ (GET)'
+            'application_status': '/api/apply/status/<ticket>/ (GET)',
+            'get_applicants': '/api/applicants/<job_id>/ (GET)',
+            'get_applications': '/api/applications/?email= (GET)',
+            'lookup_applications': '/api/applications/lookup/ (POST, {"emails": [...]})',
+            'get_archived_jobs': '/api/archive/jobs/?cursor=&limit=&company_id= (GET)',
+            'get_archived_job': '/api/archive/jobs/<id>/ (GET)'
         },
         'docs': 'Send POST requests with JSON data, GET requests need no body'
-    })
\ No newline at end of file
+    }
+
+def api_welcome(request):
+    """Welcome page for the API"""
+    return JsonResponse(welcome_data())
\ No newline at end of file
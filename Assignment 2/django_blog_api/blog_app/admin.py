@@ -4,10 +4,11 @@ from .models import Post, Comment
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ['title', 'author', 'created_at', 'total_likes']
+    list_display = ['title', 'author', 'created_at', 'like_count', 'comment_count']
     list_filter = ['created_at', 'author']
     search_fields = ['title', 'content']
-    readonly_fields = ['created_at']
+    readonly_fields = ['created_at', 'like_count', 'comment_count']
+    list_select_related = ['author']
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
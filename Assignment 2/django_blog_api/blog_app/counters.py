@@ -0,0 +1,59 @@
+# blog_app/counters.py
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Post
+
+COUNTERS = ('like_count', 'comment_count')
+
+
+def count_of(queryset, field):
+    """
+    Correlated COUNT(*) of queryset rows whose field points at the outer
+    post. Unlike Count() over joins, several of these in one query do not
+    multiply each other's rows, and they leave the posts ungrouped.
+    """
+    counts = (queryset.filter(**{field: OuterRef('pk')}).order_by()
+              .values(field).annotate(n=Count('*')).values('n'))
+    return Coalesce(Subquery(counts), 0)
+
+
+def actual_counts():
+    """What like_count and comment_count should be, as annotations"""
+    return {
+        'actual_likes': count_of(Post.likes.through.objects.all(), 'post'),
+        'actual_comments': count_of(Comment.objects.all(), 'post'),
+    }
+
+
+def add(post_id, counter, count=1):
+    """Atomic UPDATE ... SET counter = counter + n, no read"""
+    Post.objects.filter(id=post_id).update(**{counter: F(counter) + count})
+
+
+def remove(post_id, counter, count=1):
+    """Counterpart of add(); never goes below zero"""
+    Post.objects.filter(id=post_id, **{f'{counter}__gte': count}).update(**{counter: F(counter) - count})
+
+
+def current(post_id, counter):
+    return Post.objects.filter(id=post_id).values_list(counter, flat=True).first() or 0
+
+
+def reconcile_post_counts():
+    """
+    Recount likes and comments for every post and fix the ones that
+    drifted (raw SQL, admin edits, crashes between statements).
+    Returns [(post_id, (likes, comments) stored, (likes, comments) actual)]
+    for the rows that were corrected.
+    """
+    drifted = list(
+        Post.objects.order_by()
+        .annotate(**actual_counts())
+        .filter(~Q(like_count=F('actual_likes')) | ~Q(comment_count=F('actual_comments')))
+        .values_list('id', 'like_count', 'comment_count', 'actual_likes', 'actual_comments')
+    )
+    for post_id, _, _, likes, comments in drifted:
+        Post.objects.filter(id=post_id).update(like_count=likes, comment_count=comments)
+    return [(post_id, (stored_likes, stored_comments), (likes, comments))
+            for post_id, stored_likes, stored_comments, likes, comments in drifted]
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog_app import likes
+
+
+class Command(BaseCommand):
+    help = 'Apply queued likes/unlikes in batched transactions and update Post.like_count once per post'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=likes.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling for new events instead of exiting when the queue is empty')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep between polls with --loop')
+
+    def handle(self, *args, **options):
+        # Run a single worker: SQLite has one writer anyway and events are
+        # not locked against a second concurrent drain
+        while True:
+            processed = likes.drain_queue(options['batch_size'])
+            if processed:
+                self.stdout.write(f'Processed {processed} like events')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog_app.counters import reconcile_post_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount likes and comments per post and repair any drift in Post.like_count / comment_count'
+
+    def handle(self, *args, **options):
+        drifted = reconcile_post_counts()
+        for post_id, (stored_likes, stored_comments), (likes, comments) in drifted:
+            self.stdout.write(f'Post {post_id}: likes {stored_likes} -> {likes}, '
+                              f'comments {stored_comments} -> {comments}')
+        self.stdout.write(self.style.SUCCESS(f'Fixed {len(drifted)} post(s)'))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:44
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_post_counts(apps, schema_editor):
+    Post = apps.get_model('blog_app', 'Post')
+    Comment = apps.get_model('blog_app', 'Comment')
+
+    def count_of(queryset, field):
+        counts = (queryset.filter(**{field: OuterRef('pk')}).order_by()
+                  .values(field).annotate(n=Count('*')).values('n'))
+        return Coalesce(Subquery(counts), 0)
+
+    Post.objects.update(
+        like_count=count_of(Post.likes.through.objects.all(), 'post'),
+        comment_count=count_of(Comment.objects.all(), 'post'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0002_post_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_post_counts, migrations.RunPython.noop),
+    ]
@@ -10,21 +10,30 @@ class Post(models.Model):
     - title: Post title
     - content: Post content
     - created_at: When post was created
+    - like_count / comment_count: denormalized counts, maintained with F()
+      updates by the views (see blog_app/counters.py) and repaired by
+      reconcile_post_counts
     """
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
     title = models.CharField(max_length=200)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     likes = models.ManyToManyField(User, related_name='liked_posts', blank=True)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
     
     class Meta:
         ordering = ['-created_at']  # Latest posts first
+        indexes = [
+            # Cursor pagination of the feed walks (-created_at, id)
+            models.Index(fields=['-created_at', 'id'], name='post_created_id_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} by {self.author.username}"
     
     def total_likes(self):
-        return self.likes.count()
+        return self.like_count
 
 class Comment(models.Model):
     """
@@ -41,6 +50,30 @@ class Comment(models.Model):
     
     class Meta:
         ordering = ['-created_at']  # Latest comments first
+        indexes = [
+            # A post's comments page by page, newest first (cursor on created_at, id)
+            models.Index(fields=['post', '-created_at', 'id'], name='comment_post_created_idx'),
+        ]
     
     def __str__(self):
-        return f"Comment by {self.user.username} on {self.post.title}"
\ No newline at end of file
+        return f"Comment by {self.user.username} on {self.post.title}"
+
+class LikeEvent(models.Model):
+    """
+    Queued like/unlike (buffered like mode, see blog_app/likes.py).
+    liked is the state the click asked for; process_like_queue applies
+    the events in batches and deletes them.
+    """
+    post_id = models.BigIntegerField()  # checked by the worker, not at enqueue time
+    user_id = models.BigIntegerField()
+    liked = models.BooleanField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            # Latest pending state of one (post, user), for the next toggle
+            models.Index(fields=['post_id', 'user_id', '-id'], name='likeevent_post_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{'Like' if self.liked else 'Unlike'} of post {self.post_id} by user {self.user_id}"
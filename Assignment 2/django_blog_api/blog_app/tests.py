@@ -1,3 +1,277 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from django_common.db_routing import PrimaryReplicaRouter, ReadReplicaMiddleware
+
+from .counters import reconcile_post_counts
+from . import likes
+from .likes import toggle_like
+from .models import LikeEvent, Post, Comment
+
+
+class BlogTestCase(TestCase):
+    """Shared fixtures: two users, a few posts with likes and comments"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', 'alice@example.com', 'pass12345')
+        cls.bob = User.objects.create_user('bob', 'bob@example.com', 'pass12345')
+        cls.posts = []
+        for i in range(6):
+            post = Post.objects.create(author=cls.alice if i % 2 else cls.bob,
+                                       title=f'Post {i}', content='Hello')
+            post.likes.add(cls.alice)
+            if i % 2:
+                post.likes.add(cls.bob)
+            for j in range(i):
+                Comment.objects.create(post=post, user=cls.bob, text=f'Comment {j}')
+            cls.posts.append(post)
+        # The fixtures bypass the views, so fill the counters in one go
+        reconcile_post_counts()
+
+
+class SQLInstrumentationTests(BlogTestCase):
+
+    def test_headers_on_every_response(self):
+        response = self.client.get('/api/posts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('X-DB-Query-Count', response)
+        self.assertIn('X-DB-Repeated-Queries', response)
+        self.assertTrue(response['Server-Timing'].startswith('db;dur='))
+
+
+class FeedSerializationTests(BlogTestCase):
+
+    def test_feed_rows_carry_counts_without_per_post_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/posts/', {'limit': 5})
+        self.assertEqual(len(queries), 2)  # COUNT for the paginator + one page query
+        posts = {p['title']: p for p in response.json()['posts']}
+        self.assertEqual(posts['Post 5']['total_likes'], 2)
+        self.assertEqual(posts['Post 5']['total_comments'], 5)
+        self.assertEqual(posts['Post 2']['author'], 'bob')
+
+    def test_feed_query_count_does_not_grow_with_page_size(self):
+        for i in range(30):
+            Post.objects.create(author=self.bob, title=f'Extra {i}', content='x').likes.add(self.alice)
+        for limit in (1, 10, 36, 100):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/posts/', {'limit': limit})
+            self.assertEqual(len(queries), 2, limit)
+            self.assertEqual(len(response.json()['posts']), min(limit, 36))
+        # Counts are columns on the post row: no join fan-out, no GROUP BY over posts
+        self.assertNotIn('GROUP BY "blog_app_post"', queries[1]['sql'])
+        self.assertEqual(self.client.get('/api/posts/', {'limit': 'x'}).status_code, 400)
+
+    def test_detail_comments_read_as_rows(self):
+        post = self.posts[4]
+        response = self.client.get(f'/api/post/{post.id}/')
+        comments = response.json()['post']['comments']
+        self.assertEqual(len(comments), 4)
+        self.assertEqual({c['user'] for c in comments}, {'bob'})
+        self.assertEqual(comments[0]['created_at'],
+                         Comment.objects.filter(post=post).first().created_at.isoformat())
+
+
+class DatabaseRoutingTests(TestCase):
+
+    def route(self, method, *, write=False):
+        """Aliases a read gets before and after an optional write inside a request"""
+        router = PrimaryReplicaRouter()
+        seen = []
+
+        def view(request):
+            seen.append(router.db_for_read(Post))
+            if write:
+                router.db_for_write(Post)
+            seen.append(router.db_for_read(Post))
+            return None
+
+        ReadReplicaMiddleware(view)(getattr(RequestFactory(), method)('/'))
+        return seen
+
+    def test_safe_requests_read_from_replica_until_they_write(self):
+        self.assertEqual(self.route('get'), ['replica', 'replica'])
+        self.assertEqual(self.route('get', write=True), ['replica', 'default'])
+
+    def test_unsafe_requests_and_code_outside_requests_use_primary(self):
+        self.assertEqual(self.route('post'), ['default', 'default'])
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(Post), 'default')
+        self.assertFalse(PrimaryReplicaRouter().allow_migrate('replica', 'blog_app'))
+
+
+class FeedCursorTests(BlogTestCase):
+
+    def test_cursor_walks_feed_without_count(self):
+        seen = []
+        cursor = ''
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/posts/', {'cursor': cursor, 'limit': 4})
+            self.assertEqual(len(queries), 1)
+            self.assertNotIn('COUNT(*) AS "__count"', queries[0]['sql'])
+            data = response.json()
+            self.assertNotIn('total_posts', data)
+            seen.extend(post['title'] for post in data['posts'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, [f'Post {i}' for i in reversed(range(6))])
+
+    def test_include_total_and_bad_cursor(self):
+        response = self.client.get('/api/posts/', {'cursor': '', 'include_total': 1, 'limit': 1000})
+        self.assertEqual(response.json()['total_posts'], 6)
+        self.assertEqual(len(response.json()['posts']), 6)
+        self.assertEqual(self.client.get('/api/posts/', {'cursor': 'nope'}).status_code, 400)
+
+
+class PostCounterTests(BlogTestCase):
+
+    def counts(self, post):
+        post.refresh_from_db()
+        return post.like_count, post.comment_count
+
+    def test_views_keep_counters_in_step(self):
+        post = self.posts[0]
+        self.assertEqual(self.counts(post), (1, 0))
+        self.client.force_login(self.bob)
+
+        response = self.client.post(f'/api/post/{post.id}/like/')
+        self.assertEqual(response.json()['total_likes'], 2)
+        response = self.client.post(f'/api/post/{post.id}/comment/', {'text': 'Hi'},
+                                    content_type='application/json')
+        comment_id = response.json()['comment']['id']
+        self.assertEqual(self.counts(post), (2, 1))
+
+        self.client.post(f'/api/post/{post.id}/like/')
+        self.client.delete(f'/api/comment/{comment_id}/delete/')
+        self.assertEqual(self.counts(post), (1, 0))
+
+    def test_reads_use_columns(self):
+        post = self.posts[5]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/posts/', {'cursor': ''})
+        self.assertNotIn('blog_app_comment', queries[0]['sql'])
+        self.assertNotIn('blog_app_post_likes', queries[0]['sql'])
+        self.assertEqual(self.client.get(f'/api/post/{post.id}/').json()['post']['total_likes'], 2)
+
+    def test_reconcile_repairs_drift(self):
+        Post.objects.filter(id=self.posts[3].id).update(like_count=40, comment_count=0)
+        out = StringIO()
+        call_command('reconcile_post_counts', stdout=out)
+        self.assertIn(f'Post {self.posts[3].id}: likes 40 -> 2, comments 0 -> 3', out.getvalue())
+        self.assertIn('Fixed 1 post(s)', out.getvalue())
+        self.assertEqual(self.counts(self.posts[3]), (2, 3))
+        self.assertEqual(reconcile_post_counts(), [])
+
+
+class LikeToggleTests(BlogTestCase):
+
+    def like(self, user, post):
+        self.client.force_login(user)
+        return self.client.post(f'/api/post/{post.id}/like/')
+
+    def test_toggle_cost_does_not_depend_on_likers(self):
+        post = self.posts[0]
+        fans = User.objects.bulk_create([User(username=f'fan{i}') for i in range(200)])
+        Post.likes.through.objects.bulk_create(
+            [Post.likes.through(post=post, user=fan) for fan in fans])
+        reconcile_post_counts()
+        self.client.force_login(self.bob)
+        for liked, total in ((True, 202), (False, 201)):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(f'/api/post/{post.id}/like/')
+            self.assertEqual((response.json()['liked'], response.json()['total_likes']), (liked, total))
+            sql = ' '.join(q['sql'] for q in queries)
+            self.assertNotIn('FROM "auth_user" INNER JOIN', sql)
+            self.assertNotIn('COUNT(', sql)
+        # Unlike: the DELETE is the only statement on the through table
+        touching = [q['sql'] for q in queries if '"blog_app_post_likes"' in q['sql']]
+        self.assertEqual(len(touching), 1)
+        self.assertTrue(touching[0].startswith('DELETE'))
+        self.assertEqual(self.like(self.bob, self.posts[1]).status_code, 200)
+        self.assertEqual(self.client.post('/api/post/999999/like/').status_code, 404)
+
+    @override_settings(BLOG_BUFFER_LIKES=True)
+    def test_buffered_likes_coalesce_into_one_counter_update(self):
+        post = self.posts[0]
+        for _ in range(3):
+            response = self.like(self.bob, post)  # like, unlike, like
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()['liked'])
+        self.assertEqual(self.like(self.alice, post).json()['liked'], False)
+        self.assertEqual(LikeEvent.objects.count(), 4)
+        post.refresh_from_db()
+        self.assertEqual(post.like_count, 1)  # nothing applied yet
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('process_like_queue', stdout=out)
+        self.assertIn('Processed 4 like events', out.getvalue())
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "blog_app_post"')]
+        self.assertEqual(len(updates), 0)  # +1 bob and -1 alice cancel out
+        post.refresh_from_db()
+        self.assertEqual(post.like_count, 1)
+        self.assertEqual(list(post.likes.values_list('username', flat=True)), ['bob'])
+        self.assertFalse(LikeEvent.objects.exists())
+        self.assertEqual(reconcile_post_counts(), [])
+
+    @override_settings(BLOG_BUFFER_LIKES=True)
+    def test_queued_like_racing_a_direct_like_counts_once(self):
+        post = self.posts[0]
+        self.assertTrue(self.like(self.bob, post).json()['liked'])
+        liked_pairs = likes._liked_pairs
+        counts = []
+
+        def direct_like_first(pairs):
+            if not counts:
+                # like_post with the queue off lands after `existing` was read
+                toggle_like(post.id, self.bob.id)
+            counts.append(liked_pairs(pairs))
+            return counts[-1]
+
+        with mock.patch.object(likes, '_liked_pairs', direct_like_first):
+            call_command('process_like_queue', stdout=StringIO())
+        self.assertEqual(counts, [{post.id: 1}, {post.id: 1}])
+        post.refresh_from_db()
+        self.assertEqual(post.likes.filter(id=self.bob.id).count(), 1)
+        self.assertEqual(reconcile_post_counts(), [])
+
+
+class CommentPaginationTests(BlogTestCase):
+
+    def test_detail_queries_do_not_grow_with_comments(self):
+        post = self.posts[2]
+        Comment.objects.bulk_create([Comment(post=post, user=self.alice if i % 2 else self.bob,
+                                             text=f'Bulk {i}') for i in range(300)])
+        reconcile_post_counts()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/post/{post.id}/', {'comments_limit': 25})
+        self.assertEqual(len(queries), 2)  # post row + one page of comments
+        data = response.json()['post']
+        self.assertEqual((data['author'], data['total_likes'], data['total_comments']), ('bob', 1, 302))
+        self.assertEqual(len(data['comments']), 25)
+
+        seen = [c['id'] for c in data['comments']]
+        cursor = data['comments_next_cursor']
+        while cursor:
+            with CaptureQueriesContext(connection) as queries:
+                page = self.client.get(f'/api/post/{post.id}/comments/', {'cursor': cursor, 'limit': 100}).json()
+            self.assertEqual(len(queries), 2)  # post exists + one page
+            seen.extend(c['id'] for c in page['comments'])
+            cursor = page['next_cursor']
+        expected = Comment.objects.filter(post=post).order_by('-created_at', 'id').values_list('id', flat=True)
+        self.assertEqual(seen, list(expected))
+
+    def test_comments_endpoint_errors(self):
+        post = self.posts[1]
+        self.assertEqual(self.client.get(f'/api/post/{post.id}/comments/').json()['next_cursor'], None)
+        self.assertEqual(self.client.get(f'/api/post/{post.id}/comments/', {'cursor': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/post/999999/comments/').status_code, 404)
+        self.assertEqual(self.client.get('/api/post/999999/').status_code, 404)
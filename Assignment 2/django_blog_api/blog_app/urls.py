@@ -12,6 +12,7 @@ urlpatterns = [
     path('api/create-post/', views.create_post, name='create_post'),
     path('api/posts/', views.get_posts, name='get_posts'),
     path('api/post/<int:post_id>/', views.get_post_detail, name='get_post_detail'),
+    path('api/post/<int:post_id>/comments/', views.get_post_comments, name='get_post_comments'),
     path('api/post/<int:post_id>/comment/', views.add_comment, name='add_comment'),
     path('api/post/<int:post_id>/like/', views.like_post, name='like_post'),
     path('api/post/<int:post_id>/edit/', views.edit_post, name='edit_post'),
@@ -1,5 +1,6 @@
 # blog_app/views.py
 import json
+from operator import itemgetter
 from django.http import JsonResponse
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
@@ -7,9 +8,36 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django_common.pagination import InvalidCursor, keyset_page, parse_limit
+from django_common.rows import RowJsonResponse, RowSerializer
+from . import counters, likes
 from .models import Post, Comment
 
+# List shapes read with values_list() instead of model instances
+# (see django_common/rows.py)
+POST_ROWS = RowSerializer({
+    'id': 'id',
+    'title': 'title',
+    'content': 'content',
+    'author': 'author__username',
+    'created_at': 'created_at',
+    'total_likes': 'like_count',
+    'total_comments': 'comment_count'
+})
+
+# (created_at, id) of a POST_ROWS row, for cursor pagination
+POST_CURSOR_KEY = itemgetter(POST_ROWS.index('created_at'), POST_ROWS.index('id'))
+
+COMMENT_ROWS = RowSerializer({
+    'id': 'id',
+    'text': 'text',
+    'user': 'user__username',
+    'created_at': 'created_at'
+})
+
+COMMENT_CURSOR_KEY = itemgetter(COMMENT_ROWS.index('created_at'), COMMENT_ROWS.index('id'))
+
 # Helper function to check if user is authenticated
 def is_authenticated(request):
     return request.user.is_authenticated
@@ -158,41 +186,58 @@ def create_post(request):
             'content': post.content,
             'author': post.author.username,
             'created_at': post.created_at.isoformat(),
-            'total_likes': post.total_likes()
+            'total_likes': post.like_count
         }
     }, status=201)
 
+POST_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+COMMENT_PAGE_SIZE = 20
+
 @require_http_methods(["GET"])
 def get_posts(request):
     """
     Get all blog posts with pagination
     GET /api/posts/?page=1&limit=10
+    Cursor mode ("load more"): GET /api/posts/?cursor=&limit=10, then pass
+    back next_cursor. Each page is one index range scan with no COUNT(*);
+    add &include_total=1 to get total_posts anyway.
     """
-    # Get pagination parameters
-    page = int(request.GET.get('page', 1))
-    limit = int(request.GET.get('limit', 10))
+    # Get all posts: one query for the page, author and both counts included
+    # (the counts are columns on the post row)
+    posts = POST_ROWS.values(Post.objects.all())
+    build = POST_ROWS.builder(Post)
+    
+    if 'cursor' in request.GET:
+        try:
+            limit = parse_limit(request.GET.get('limit'), default=POST_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+            page, next_cursor = keyset_page(posts, request.GET['cursor'], limit, key=POST_CURSOR_KEY)
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        data = {
+            'posts': [build(row) for row in page],
+            'next_cursor': next_cursor
+        }
+        if request.GET.get('include_total') in ('1', 'true'):
+            data['total_posts'] = Post.objects.count()
+        return RowJsonResponse(data)
     
-    # Get all posts
-    posts = Post.objects.all()
+    # Get pagination parameters
+    try:
+        page = int(request.GET.get('page', 1))
+        limit = min(max(int(request.GET.get('limit', POST_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'page and limit must be integers'}, status=400)
     
     # Paginate
     paginator = Paginator(posts, limit)
     page_obj = paginator.get_page(page)
     
     # Serialize posts
-    posts_data = []
-    for post in page_obj:
-        posts_data.append({
-            'id': post.id,
-            'title': post.title,
-            'content': post.content,
-            'author': post.author.username,
-            'created_at': post.created_at.isoformat(),
-            'total_likes': post.total_likes(),
-            'total_comments': post.comments.count()
-        })
+    posts_data = [build(row) for row in page_obj]
     
-    return JsonResponse({
+    return RowJsonResponse({
         'posts': posts_data,
         'pagination': {
             'current_page': page,
@@ -203,39 +248,58 @@ def get_posts(request):
         }
     })
 
+def comment_page(post_id, cursor, limit):
+    """
+    One page of a post's comments, newest first, as (rows, next_cursor).
+    Walks comment_post_created_idx; the commenter's username comes from
+    the same query's join, not one query per comment.
+    """
+    comments = COMMENT_ROWS.values(Comment.objects.filter(post_id=post_id))
+    rows, next_cursor = keyset_page(comments, cursor, limit, key=COMMENT_CURSOR_KEY)
+    build = COMMENT_ROWS.builder(Comment)
+    return [build(row) for row in rows], next_cursor
+
 @require_http_methods(["GET"])
 def get_post_detail(request, post_id):
     """
-    Get post detail with comments
-    GET /api/post/<id>/
+    Get post detail with the first page of comments
+    GET /api/post/<id>/?comments_limit=20
+    More comments: GET /api/post/<id>/comments/?cursor=<comments_next_cursor>
     """
     try:
-        post = Post.objects.get(id=post_id)
-    except Post.DoesNotExist:
+        limit = parse_limit(request.GET.get('comments_limit'), default=COMMENT_PAGE_SIZE,
+                            maximum=MAX_PAGE_SIZE)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    # Post, author and counts in one row
+    row = POST_ROWS.values(Post.objects.filter(id=post_id)).first()
+    if row is None:
         return JsonResponse({'error': 'Post not found'}, status=404)
     
-    # Get comments for this post
-    comments = post.comments.all()
-    comments_data = []
-    for comment in comments:
-        comments_data.append({
-            'id': comment.id,
-            'text': comment.text,
-            'user': comment.user.username,
-            'created_at': comment.created_at.isoformat()
-        })
+    post_data = POST_ROWS.builder(Post)(row)
+    post_data['comments'], post_data['comments_next_cursor'] = comment_page(post_id, None, limit)
     
-    post_data = {
-        'id': post.id,
-        'title': post.title,
-        'content': post.content,
-        'author': post.author.username,
-        'created_at': post.created_at.isoformat(),
-        'total_likes': post.total_likes(),
-        'comments': comments_data
-    }
-    
-    return JsonResponse({'post': post_data})
+    return RowJsonResponse({'post': post_data})
+
+@require_http_methods(["GET"])
+def get_post_comments(request, post_id):
+    """
+    Get a post's comments with cursor pagination
+    GET /api/post/<id>/comments/?cursor=&limit=20, then pass back next_cursor
+    """
+    try:
+        limit = parse_limit(request.GET.get('limit'), default=COMMENT_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+        if not Post.objects.filter(id=post_id).exists():
+            return JsonResponse({'error': 'Post not found'}, status=404)
+        comments, next_cursor = comment_page(post_id, request.GET.get('cursor'), limit)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return RowJsonResponse({
+        'comments': comments,
+        'next_cursor': next_cursor
+    })
 
 @csrf_exempt
 @require_http_methods(["POST"])
@@ -261,12 +325,14 @@ def add_comment(request, post_id):
     if not text:
         return JsonResponse({'error': 'Comment text is required'}, status=400)
     
-    # Create comment
-    comment = Comment.objects.create(
-        post=post,
-        user=request.user,
-        text=text
-    )
+    # Create comment and bump the post's counter together
+    with transaction.atomic():
+        comment = Comment.objects.create(
+            post=post,
+            user=request.user,
+            text=text
+        )
+        counters.add(post.id, 'comment_count')
     
     return JsonResponse({
         'message': 'Comment added successfully',
@@ -288,25 +354,25 @@ def like_post(request, post_id):
     if not is_authenticated(request):
         return JsonResponse({'error': 'Authentication required'}, status=401)
     
-    try:
-        post = Post.objects.get(id=post_id)
-    except Post.DoesNotExist:
+    if not Post.objects.filter(id=post_id).exists():
         return JsonResponse({'error': 'Post not found'}, status=404)
     
-    # Toggle like
-    if request.user in post.likes.all():
-        post.likes.remove(request.user)
-        liked = False
-        message = 'Post unliked'
-    else:
-        post.likes.add(request.user)
-        liked = True
-        message = 'Post liked'
+    if likes.queue_enabled():
+        liked = likes.enqueue_toggle(post_id, request.user.id)
+        return JsonResponse({
+            'message': 'Like queued' if liked else 'Unlike queued',
+            'liked': liked,
+            # Applied by process_like_queue; until then this lags behind
+            'total_likes': counters.current(post_id, 'like_count')
+        }, status=202)
+    
+    # Toggle like: one indexed DELETE, plus one INSERT if nothing was there
+    liked = likes.toggle_like(post_id, request.user.id)
     
     return JsonResponse({
-        'message': message,
+        'message': 'Post liked' if liked else 'Post unliked',
         'liked': liked,
-        'total_likes': post.total_likes()
+        'total_likes': counters.current(post_id, 'like_count')
     })
 
 @csrf_exempt
@@ -354,7 +420,7 @@ def edit_post(request, post_id):
             'content': post.content,
             'author': post.author.username,
             'created_at': post.created_at.isoformat(),
-            'total_likes': post.total_likes()
+            'total_likes': post.like_count
         }
     })
 
@@ -399,5 +465,7 @@ def delete_comment(request, comment_id):
     if comment.user != request.user:
         return JsonResponse({'error': 'Permission denied'}, status=403)
     
-    comment.delete()
+    with transaction.atomic():
+        comment.delete()
+        counters.remove(comment.post_id, 'comment_count')
     return JsonResponse({'message': 'Comment deleted successfully'})
\ No newline at end of file
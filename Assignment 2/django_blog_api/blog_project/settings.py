@@ -1,9 +1,16 @@
 # blog_project/settings.py
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# django_common (instrumentation, row serialization, replica routing) is
+# shared with the other project and lives in the repository's shared/ dir
+SHARED_DIR = str(BASE_DIR.parent.parent / 'shared')
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+
 SECRET_KEY = 'your-secret-key-here'
 
 DEBUG = True
@@ -22,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'django_common.sql_instrumentation.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,6 +67,17 @@ DATABASES = {
     }
 }
 
+# Queue like/unlike clicks (202) and let `manage.py process_like_queue --loop`
+# apply them in batches, instead of one counter update per like_post request
+BLOG_BUFFER_LIKES = False
+
+# Per-request query count/time headers and N+1 warnings, see django_common/sql_instrumentation.py
+SQL_INSTRUMENTATION = {
+    'QUERY_COUNT_WARNING': 50,
+    'REPEATED_QUERY_THRESHOLD': 5,
+    'RAISE': False,  # raise QueryBudgetExceeded instead of logging (useful in tests)
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -0,0 +1,12 @@
+# blog_project/settings_replica.py
+# Read/write split profile, see django_common/replica.py:
+#
+#   DJANGO_SETTINGS_MODULE=blog_project.settings_replica python manage.py runserver
+from .settings import *  # noqa: F401,F403
+
+# After the base settings, which put django_common on sys.path
+from django_common.replica import READ_ALIAS, ROUTER, use_sqlite_replica  # noqa: E402
+
+MIDDLEWARE = use_sqlite_replica(DATABASES, MIDDLEWARE)  # noqa: F405
+READ_DATABASE_ALIAS = READ_ALIAS
+DATABASE_ROUTERS = [ROUTER]
@@ -0,0 +1,12 @@
+"""
+Code shared by the job portal and blog projects.
+
+    sql_instrumentation  per-request query count/time headers, N+1 warnings
+    rows                 values_list() row serialization, RowJsonResponse
+    db_routing           primary/read-replica router and request middleware
+    pagination           keyset pagination and cursor tokens
+    replica              settings helper for the read-only SQLite replica
+
+Each project's settings.py puts the shared/ directory on sys.path, so
+these import as django_common.<module> under manage.py, WSGI and ASGI.
+"""
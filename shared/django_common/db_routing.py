@@ -0,0 +1,87 @@
+# django_common/db_routing.py
+"""
+Read/write splitting between the primary database and a read alias.
+
+ReadReplicaMiddleware marks each request: GET/HEAD requests may read
+from settings.READ_DATABASE_ALIAS, every other method stays on the
+primary. PrimaryReplicaRouter sends reads to the read alias only while
+that is allowed, and pins the rest of the request to the primary as
+soon as anything is written, so a read that follows a write sees it.
+Outside of requests (shell, management commands) everything uses the
+primary.
+
+With SQLite the read alias is the same file opened with ?mode=ro in WAL
+mode (see django_common/replica.py). Readers then never block the writer and
+see every committed write, with no replication lag to handle.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+# None outside requests, else {'reads': bool, 'pinned': bool}
+_request_state = ContextVar('db_routing_request_state', default=None)
+
+
+def read_alias():
+    return getattr(settings, 'READ_DATABASE_ALIAS', 'replica')
+
+
+def pin_to_primary():
+    """Send the remaining queries of this request to the primary"""
+    state = _request_state.get()
+    if state is not None:
+        state['pinned'] = True
+
+
+def _new_state(request):
+    return {'reads': request.method in ('GET', 'HEAD'), 'pinned': False}
+
+
+class ReadReplicaMiddleware:
+    # Async capable so ASGI requests stay async; sync_to_async copies the
+    # context into the ORM thread and the state dict is shared, so a pin
+    # made there is seen by later reads
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _request_state.set(_new_state(request))
+        try:
+            return self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+    async def __acall__(self, request):
+        token = _request_state.set(_new_state(request))
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not state['reads'] or state['pinned']:
+            return 'default'
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases are views of the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -0,0 +1,102 @@
+# django_common/pagination.py
+"""
+Keyset pagination over (-created_at, id) with opaque cursor tokens.
+
+DEFAULT_PAGE_SIZE and MAX_PAGE_SIZE are only fallbacks: callers with
+their own page size pass it to parse_limit() as default (and maximum).
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor or page size from the client cannot be used"""
+
+
+def encode_token(data):
+    """Opaque URL-safe token for a small JSON-able dict"""
+    raw = json.dumps(data, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_token(token):
+    """Inverse of encode_token, raises InvalidCursor on garbage"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(data, dict):
+        raise InvalidCursor('Invalid cursor')
+    return data
+
+
+def encode_cursor(created_at, pk):
+    """Turn the last row's (created_at, id) into an opaque token"""
+    return encode_token({'c': created_at.isoformat(), 'i': pk})
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor, returns (created_at, id)"""
+    data = decode_token(token)
+    try:
+        return datetime.fromisoformat(data['c']), int(data['i'])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Read ?limit=, clamped to [1, maximum]"""
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise InvalidCursor('limit must be an integer')
+    return max(1, min(limit, maximum))
+
+
+def keyset_queryset(queryset, cursor=None, created_field='created_at'):
+    """
+    Order by (-created_at, id) and, given a cursor, start right after the
+    row it points at. Instead of OFFSET every page is one index range scan.
+    """
+    queryset = queryset.order_by(f'-{created_field}', 'id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{created_field}__lt': created_at}) |
+            Q(**{created_field: created_at, 'id__gt': pk})
+        )
+    return queryset
+
+
+def finish_page(rows, limit, created_field='created_at', key=None):
+    """
+    rows holds up to limit + 1 items, the extra one only tells whether
+    another page exists. key(row) -> (created_at, id) reads the cursor
+    position from a row, by default from model attributes.
+    Returns (rows, next_cursor).
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if key is None:
+            last = rows[-1]
+            next_cursor = encode_cursor(getattr(last, created_field), last.id)
+        else:
+            next_cursor = encode_cursor(*key(rows[-1]))
+    return rows, next_cursor
+
+
+def keyset_page(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE,
+                created_field='created_at', key=None):
+    """Return (rows, next_cursor) for one page of a (-created_at, id) listing"""
+    queryset = keyset_queryset(queryset, cursor, created_field)
+    return finish_page(list(queryset[:limit + 1]), limit, created_field, key)
@@ -0,0 +1,36 @@
+# django_common/replica.py
+"""
+Read/write split profile: GET requests read through a second, read-only
+connection to the same SQLite file, writes and everything after them in
+the request go to the primary (see django_common/db_routing.py).
+
+A project's settings_replica.py starts from its settings and calls
+use_sqlite_replica() with them.
+"""
+
+READ_ALIAS = 'replica'
+ROUTER = 'django_common.db_routing.PrimaryReplicaRouter'
+MIDDLEWARE = 'django_common.db_routing.ReadReplicaMiddleware'
+
+
+def use_sqlite_replica(databases, middleware):
+    """
+    Add the read-only alias to databases (in place) and return the
+    middleware list with ReadReplicaMiddleware in it.
+    """
+    databases['default'].setdefault('OPTIONS', {}).update({
+        # WAL lets readers and the single writer work at the same time
+        'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL',
+        'timeout': 20,
+    })
+    databases[READ_ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        # The sqlite3 backend always opens with uri=True, so mode=ro applies
+        'NAME': f"file:{databases['default']['NAME']}?mode=ro",
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    }
+    # Right after the instrumentation so the whole request is routed
+    middleware = list(middleware)
+    middleware.insert(1, MIDDLEWARE)
+    return middleware
@@ -0,0 +1,224 @@
+# django_common/sql_instrumentation.py
+"""
+Per-request SQL instrumentation middleware.
+
+Records every query a request runs (through connection.execute_wrapper),
+then reports on the response:
+
+    Server-Timing: db;dur=12.4;desc="7 queries"
+    X-DB-Query-Count: 7
+    X-DB-Time-Ms: 12.4
+    X-DB-Repeated-Queries: 1
+
+Queries are grouped by statement template (placeholders and IN lists
+collapsed). A template that runs REPEATED_QUERY_THRESHOLD times or more
+in one request is the usual sign of an N+1 loop and is logged. So is a
+request that goes over QUERY_COUNT_WARNING queries. With RAISE set, for
+example in tests, either case raises QueryBudgetExceeded instead.
+
+The middleware is sync and async capable, so it does not force an ASGI
+deployment's async views back onto a thread. Under ASGI the recorder is
+installed from the request's thread-sensitive thread, where the ORM runs.
+Streaming responses send their headers before the body queries run, so
+they get no X-DB-* headers; recording continues until the body is fully
+sent and the totals are checked (and logged at DEBUG) then. Under ASGI a
+sync streaming body is handed on as an async iterator that pulls one
+chunk at a time, so it still streams instead of being buffered whole by
+StreamingHttpResponse.
+
+Configure with a dict in settings (all keys optional):
+
+    SQL_INSTRUMENTATION = {
+        'QUERY_COUNT_WARNING': 50,
+        'REPEATED_QUERY_THRESHOLD': 5,
+        'RAISE': False,
+    }
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('sql_instrumentation')
+
+DEFAULTS = {
+    'QUERY_COUNT_WARNING': 50,
+    'REPEATED_QUERY_THRESHOLD': 5,
+    'RAISE': False,
+}
+
+_IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran too many queries or repeated a statement too often"""
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'SQL_INSTRUMENTATION', {}))
+    return config
+
+
+def statement_template(sql):
+    """Reduce a statement to its shape so repeats with other values group together"""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    return _IN_LIST_RE.sub('IN (...)', sql)
+
+
+class QueryRecorder:
+    """execute_wrapper hook collecting (template, seconds) per statement"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((statement_template(sql), time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_ms(self):
+        return sum(seconds for _, seconds in self.queries) * 1000
+
+    def repeated(self, threshold):
+        """[(template, times)] for templates run at least threshold times"""
+        counts = Counter(template for template, _ in self.queries)
+        return [(template, n) for template, n in counts.most_common() if n >= threshold]
+
+
+def _start_recording(recorder):
+    """Install recorder on this thread's connections, returns the ExitStack to close"""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(recorder))
+    return stack
+
+
+def _check(request, recorder):
+    """Log, or raise with RAISE, when the request went over budget"""
+    config = get_config()
+    problems = []
+    if recorder.count > config['QUERY_COUNT_WARNING']:
+        problems.append(f'{recorder.count} queries (limit {config["QUERY_COUNT_WARNING"]})')
+    for template, times in recorder.repeated(config['REPEATED_QUERY_THRESHOLD']):
+        problems.append(f'probable N+1, {times}x: {template}')
+
+    if problems:
+        message = f'{request.method} {request.path}: ' + '; '.join(problems)
+        if config['RAISE']:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+def _report(request, response, recorder):
+    repeated = recorder.repeated(get_config()['REPEATED_QUERY_THRESHOLD'])
+    response['Server-Timing'] = f'db;dur={recorder.total_ms:.1f};desc="{recorder.count} queries"'
+    response['X-DB-Query-Count'] = str(recorder.count)
+    response['X-DB-Time-Ms'] = f'{recorder.total_ms:.1f}'
+    response['X-DB-Repeated-Queries'] = str(len(repeated))
+    _check(request, recorder)
+
+
+def _finish_stream(request, recorder):
+    _check(request, recorder)
+    logger.debug('%s %s streamed: %d queries, %.1f ms', request.method, request.path,
+                 recorder.count, recorder.total_ms)
+
+
+def _record_sync_stream(request, content, recorder, stack):
+    try:
+        yield from content
+    finally:
+        stack.close()
+    _finish_stream(request, recorder)
+
+
+async def _stream_sync_body(content):
+    """
+    A sync body as an async iterator, pulled one chunk at a time on the
+    thread-sensitive thread where the view and the recorder run. Left
+    sync, StreamingHttpResponse.__aiter__ would read the whole body into a
+    list through sync_to_async before sending any of it.
+    """
+    iterator = iter(content)
+    pull = sync_to_async(next)
+    done = object()
+    try:
+        while (chunk := await pull(iterator, done)) is not done:
+            yield chunk
+    finally:
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+
+async def _record_async_stream(request, content, recorder, stack):
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        await sync_to_async(stack.close)()
+    _finish_stream(request, recorder)
+
+
+class SQLInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        stack = _start_recording(recorder)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            raise
+        if response.streaming and not response.is_async:
+            response.streaming_content = _record_sync_stream(
+                request, response.streaming_content, recorder, stack)
+            return response
+        # An async body under WSGI is consumed on another thread, nothing to record there
+        stack.close()
+        if not response.streaming:
+            _report(request, response, recorder)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        # The ORM runs on the request's thread-sensitive thread, install there
+        stack = await sync_to_async(_start_recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            await sync_to_async(stack.close)()
+            raise
+        if response.streaming:
+            content = response.streaming_content
+            if not response.is_async:
+                content = _stream_sync_body(content)
+            response.streaming_content = _record_async_stream(request, content, recorder, stack)
+            return response
+        await sync_to_async(stack.close)()
+        _report(request, response, recorder)
+        return response